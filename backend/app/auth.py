@@ -1,15 +1,22 @@
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Optional
+import hashlib
+import time
+from typing import Dict, Iterable, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
+from .core.cache import TTLCache
 
 # Configuration
 SECRET_KEY = "your-secret-key-here"  # In production, use environment variable
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 300  # seconds
+TOKEN_CACHE_SIZE = 4096
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -31,6 +38,30 @@ class User(BaseModel):
 class UserInDB(User):
     hashed_password: str
 
+class UserStore(ABC):
+    """Source of user records. Subclass to back authentication with a database."""
+
+    @abstractmethod
+    def get(self, username: str) -> Optional[UserInDB]:
+        """Return the user record, or None if there is no such user."""
+
+class InMemoryUserStore(UserStore):
+    """User store holding pre-hashed user records in a dict."""
+
+    def __init__(self, users: Iterable[UserInDB] = ()):
+        self._users: Dict[str, UserInDB] = {user.username: user for user in users}
+
+    def add(self, user: UserInDB) -> None:
+        self._users[user.username] = user
+
+    def get(self, username: str) -> Optional[UserInDB]:
+        return self._users.get(username)
+
+_user_store: Optional[UserStore] = None
+_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+# Verified tokens by SHA-256 digest -> username, each evicted at the token's exp
+_token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -53,28 +84,54 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    token_digest = hashlib.sha256(token.encode()).digest()
+    username = _token_cache.get(token_digest)
+    if username is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            username = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            _token_cache.set(token_digest, username, ttl=expires_in)
+    token_data = TokenData(username=username)
     user = get_user(username=token_data.username)
     if user is None:
         raise credentials_exception
     return user
 
+def get_token_cache_stats() -> Dict[str, int]:
+    return {"size": len(_token_cache), "hits": _token_cache.hits, "misses": _token_cache.misses}
+
+def get_user_store() -> UserStore:
+    global _user_store
+    if _user_store is None:
+        # In production, this would query a database
+        # For demo purposes, we'll use a hardcoded user, hashed once on first use
+        _user_store = InMemoryUserStore([
+            UserInDB(
+                username="demo",
+                full_name="Demo User",
+                email="demo@example.com",
+                hashed_password=get_password_hash("demo123"),
+                disabled=False,
+            )
+        ])
+    return _user_store
+
+def set_user_store(store: UserStore) -> None:
+    global _user_store
+    _user_store = store
+    _user_cache.clear()
+
 def get_user(username: str):
-    # In production, this would query a database
-    # For demo purposes, we'll use a hardcoded user
-    if username == "demo":
-        return UserInDB(
-            username="demo",
-            full_name="Demo User",
-            email="demo@example.com",
-            hashed_password=get_password_hash("demo123"),
-            disabled=False,
-        )
-    return None 
\ No newline at end of file
+    user = _user_cache.get(username)
+    if user is None:
+        user = get_user_store().get(username)
+        if user is not None:
+            _user_cache.set(username, user)
+    return user
+ 
\ No newline at end of file
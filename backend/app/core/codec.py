@@ -0,0 +1,155 @@
+from typing import Union
+import numpy as np
+
+# 2-bit nucleotide alphabet: 00 -> A, 01 -> T, 10 -> C, 11 -> G
+NUCLEOTIDES = 'ATCG'
+INVALID_CODE = 0xFF
+
+_ALPHABET = np.frombuffer(NUCLEOTIDES.encode('ascii'), dtype=np.uint8)
+
+# byte value -> its 4 nucleotides (ASCII), most significant bit pair first
+_BYTE_TO_DNA = _ALPHABET[
+    (np.arange(256, dtype=np.uint8)[:, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 0b11
+]
+
+# Same table viewed as one uint32 per byte, so a lookup moves 4 nucleotides at once
+_BYTE_TO_DNA_WORDS = _BYTE_TO_DNA.view(np.uint32).ravel()
+
+# ASCII nucleotide -> 2-bit code, INVALID_CODE for anything else
+_DNA_TO_CODE = np.full(256, INVALID_CODE, dtype=np.uint8)
+_DNA_TO_CODE[_ALPHABET] = np.arange(4, dtype=np.uint8)
+# The same mapping as a bytes.translate table, which runs at memcpy-like speed
+_DNA_TRANSLATION = _DNA_TO_CODE.tobytes()
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def bytes_to_codes(data: BytesLike) -> np.ndarray:
+    """Expand bytes into a uint8 array of 2-bit codes, 4 per byte."""
+    return (np.frombuffer(data, dtype=np.uint8)[:, None]
+            >> np.array([6, 4, 2, 0], dtype=np.uint8)).ravel() & 0b11
+
+
+def codes_to_bytes(codes: np.ndarray) -> bytes:
+    """Pack 2-bit codes into bytes, dropping a trailing incomplete byte."""
+    codes = codes[:len(codes) - len(codes) % 4].reshape(-1, 4)
+    packed = (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]
+    return packed.astype(np.uint8).tobytes()
+
+
+def dna_to_codes(dna_sequence: Union[str, BytesLike]) -> np.ndarray:
+    """Map a nucleotide string (or its ASCII bytes) to a uint8 array of 2-bit codes."""
+    if isinstance(dna_sequence, str):
+        dna_sequence = dna_sequence.encode('ascii')
+    dna_sequence = bytes(dna_sequence)
+    codes = np.frombuffer(dna_sequence.translate(_DNA_TRANSLATION), dtype=np.uint8)
+    if codes.size and codes.max() == INVALID_CODE:
+        bad = dna_sequence[int(np.argmax(codes == INVALID_CODE))]
+        raise ValueError(f"Invalid nucleotide {chr(bad)!r} in DNA sequence")
+    return codes
+
+
+def codes_to_bits(codes: np.ndarray) -> np.ndarray:
+    """Expand 2-bit codes into bits along the last axis, most significant first."""
+    width = 2 * codes.shape[-1]
+    return np.stack([codes >> 1, codes & 1], axis=-1).reshape(*codes.shape[:-1], width)
+
+
+def codes_to_dna(codes: np.ndarray) -> str:
+    """Map an array of 2-bit codes back to a nucleotide string."""
+    return _ALPHABET[codes].tobytes().decode('ascii')
+
+
+def binary_to_dna(binary_data: BytesLike) -> str:
+    """Convert binary data to a DNA sequence using table-driven 2-bit encoding."""
+    return _BYTE_TO_DNA_WORDS[np.frombuffer(binary_data, dtype=np.uint8)].tobytes().decode('ascii')
+
+
+def dna_to_binary(dna_sequence: Union[str, BytesLike]) -> bytes:
+    """Convert a DNA sequence back to binary data using the reverse lookup table."""
+    return codes_to_bytes(dna_to_codes(dna_sequence))
+
+
+def binary_to_dna_reference(binary_data: BytesLike) -> str:
+    """Pure-Python reference for binary_to_dna, kept for equivalence checks."""
+    result = []
+    for byte in bytes(binary_data):
+        # Process each byte (8 bits) into 4 nucleotides (2 bits each)
+        for i in range(0, 8, 2):
+            bits = (byte >> (6 - i)) & 0b11
+            result.append(NUCLEOTIDES[bits])
+    return ''.join(result)
+
+
+def dna_to_binary_reference(dna_sequence: str) -> bytes:
+    """Pure-Python reference for dna_to_binary, kept for equivalence checks."""
+    result = bytearray()
+    current_byte = 0
+    bit_count = 0
+
+    for nucleotide in dna_sequence:
+        bits = NUCLEOTIDES.index(nucleotide)
+        current_byte = (current_byte << 2) | bits
+        bit_count += 2
+
+        if bit_count == 8:
+            result.append(current_byte)
+            current_byte = 0
+            bit_count = 0
+
+    return bytes(result)
+
+
+# Balanced pair code: every 3 bits become one G/C base plus one A/T base.
+# Bit 2 picks the order (G/C first or A/T first), bit 1 picks C/G and bit 0
+# picks A/T, so each pair holds exactly one G/C and no run can exceed 2 bases.
+_PAIR_TABLE = np.array(
+    [[gc, at] if order == 0 else [at, gc]
+     for order in (0, 1)
+     for gc in np.frombuffer(b'CG', dtype=np.uint8)
+     for at in np.frombuffer(b'AT', dtype=np.uint8)],
+    dtype=np.uint8,
+)
+
+
+def balanced_length(num_bytes: int) -> int:
+    """Number of nucleotides the balanced pair code needs for num_bytes bytes."""
+    return 2 * -(-num_bytes * 8 // 3)
+
+
+def balanced_capacity(num_nucleotides: int) -> int:
+    """Number of whole bytes the balanced pair code fits into num_nucleotides."""
+    return (num_nucleotides // 2 * 3) // 8
+
+
+def binary_to_balanced_dna(binary_data: BytesLike) -> str:
+    """Convert binary data to a GC-balanced DNA sequence with runs of at most 2 (1.5 bits/base)."""
+    bits = np.unpackbits(np.frombuffer(binary_data, dtype=np.uint8))
+    bits = np.concatenate([bits, np.zeros(-len(bits) % 3, dtype=np.uint8)]).reshape(-1, 3)
+    values = (bits[:, 0] << 2) | (bits[:, 1] << 1) | bits[:, 2]
+    return _PAIR_TABLE[values].tobytes().decode('ascii')
+
+
+def balanced_dna_to_binary(dna_sequence: Union[str, BytesLike]) -> bytes:
+    """
+    Invert binary_to_balanced_dna.
+
+    Pairs damaged by sequencing errors (two bases of the same class) still
+    decode to some 3-bit value, leaving the byte-level fix to Reed-Solomon.
+    """
+    codes = dna_to_codes(dna_sequence)
+    if len(codes) % 2:
+        raise ValueError("Balanced DNA sequence must have an even length")
+    bits = balanced_codes_to_bits(codes)
+    return np.packbits(bits[:len(bits) - len(bits) % 8]).tobytes()
+
+
+def balanced_codes_to_bits(codes: np.ndarray) -> np.ndarray:
+    """Decode balanced pair codes along the last axis (even length) into 3 bits per pair."""
+    pairs = codes.reshape(*codes.shape[:-1], codes.shape[-1] // 2, 2)
+    # Codes 0/1 are A/T and 2/3 are C/G, so the high bit is the base class
+    first_is_gc = pairs[..., 0] >> 1
+    order = 1 - first_is_gc
+    gc = np.where(order, pairs[..., 1], pairs[..., 0]) & 1
+    at = np.where(order, pairs[..., 0], pairs[..., 1]) & 1
+    return np.stack([order, gc, at], axis=-1).reshape(*codes.shape[:-1], 3 * (codes.shape[-1] // 2))
@@ -0,0 +1,48 @@
+from typing import Optional, Union
+import hashlib
+import hmac
+from Crypto.Hash import SHA256
+from Crypto.Protocol.KDF import HKDF, PBKDF2
+from Crypto.Random import get_random_bytes
+from .cache import TTLCache
+
+PBKDF2_ITERATIONS = 100000
+KEY_CACHE_SIZE = 256
+KEY_CACHE_TTL = 600  # seconds
+
+_key_cache = TTLCache(maxsize=KEY_CACHE_SIZE, ttl=KEY_CACHE_TTL)
+# Passwords are never used as cache keys directly, only keyed hashes of them
+_cache_secret = get_random_bytes(32)
+
+
+def derive_key(password: str, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+    """Derive an AES-256 key with PBKDF2, reusing recently derived keys."""
+    password_digest = hmac.new(_cache_secret, password.encode(), hashlib.sha256).digest()
+    cache_key = (password_digest, bytes(salt), iterations)
+    key = _key_cache.get(cache_key)
+    if key is None:
+        key = PBKDF2(password.encode(), salt, dkLen=32, count=iterations)
+        _key_cache.set(cache_key, key)
+    return key
+
+
+class KeySession:
+    """
+    Master key derived once from a password, handing out per-file HKDF subkeys.
+
+    Pass a session wherever DNAEncoder accepts a password to skip PBKDF2 for
+    every file. The session salt must be kept alongside the sequences: decoding
+    needs KeySession(password, salt=session.salt).
+    """
+
+    def __init__(self, password: str, salt: Optional[bytes] = None, iterations: int = PBKDF2_ITERATIONS):
+        self.salt = salt or get_random_bytes(16)
+        self.iterations = iterations
+        self._master_key = derive_key(password, self.salt, iterations)
+
+    def subkey(self, salt: bytes) -> bytes:
+        """Derive the AES-256 key for one file from its own salt."""
+        return HKDF(self._master_key, 32, bytes(salt), SHA256)
+
+
+Password = Union[str, KeySession]
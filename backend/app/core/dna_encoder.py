@@ -1,10 +1,19 @@
-from typing import List, Tuple, Optional
+from itertools import islice, repeat
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 import numpy as np
-from reedsolo import RSCodec
 from Crypto.Cipher import AES
-from Crypto.Protocol.KDF import PBKDF2
 from Crypto.Random import get_random_bytes
 import base64
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .crypto import KeySession, Password, derive_key
+from .packed import PackedStrands
+from .reed_solomon import BatchRSCodec
+from .codec import (
+    binary_to_dna, dna_to_binary, dna_to_codes, codes_to_dna, bytes_to_codes, codes_to_bytes,
+    binary_to_balanced_dna, balanced_dna_to_binary, balanced_length, balanced_capacity,
+    codes_to_bits, balanced_codes_to_bits,
+)
 
 class DNAEncoder:
     """Core DNA encoding engine that handles conversion of data to DNA sequences."""
@@ -13,17 +22,45 @@ class DNAEncoder:
     MAX_HOMOPOLYMER_LENGTH = 3
     TARGET_GC_CONTENT = 0.5
     GC_CONTENT_TOLERANCE = 0.1
+    CODING_SCHEMES = ("binary", "constrained")
+    MAX_ADDRESS_BITS = 64
+    # Fragment IDs decode_stream accepts when the caller gives no expected count
+    MAX_STREAM_FRAGMENTS = 1 << 22
 
-    def __init__(self, base_length: int = 200, error_correction_level: str = "basic"):
+    def __init__(self, base_length: int = 200, error_correction_level: str = "basic",
+                 coding_scheme: str = "binary", address_bits: int = 16, object_id_bits: int = 0):
         """
         Initialize the DNA encoder with specific parameters.
         
         Args:
             base_length: Length of each DNA sequence
             error_correction_level: Level of error correction ("none", "basic", "robust")
+            coding_scheme: "binary" for dense 2-bit encoding with GC/homopolymer
+                post-processing, or "constrained" for the reversible balanced pair
+                code (1.5 bits/base, 50% GC and no runs longer than 2 by construction)
+            address_bits: Width of the fragment ID field (multiple of 8, e.g. 16, 32, 48)
+            object_id_bits: Width of the object ID prefix identifying the file a
+                sequence belongs to in a multi-file pool (multiple of 8, 0 to disable)
         """
+        if coding_scheme not in self.CODING_SCHEMES:
+            raise ValueError(f"Unknown coding scheme: {coding_scheme}")
+        if address_bits <= 0 or address_bits % 8 or object_id_bits < 0 or object_id_bits % 8:
+            raise ValueError("address_bits and object_id_bits must be multiples of 8")
+        if address_bits + object_id_bits > self.MAX_ADDRESS_BITS:
+            raise ValueError(f"Address fields cannot exceed {self.MAX_ADDRESS_BITS} bits")
+
         self.base_length = base_length
         self.error_correction_level = error_correction_level
+        self.coding_scheme = coding_scheme
+        self.address_bits = address_bits
+        self.object_id_bits = object_id_bits
+
+        # Nucleotides reserved for the object and fragment IDs at the start of each sequence
+        header_bytes = (object_id_bits + address_bits) // 8
+        if coding_scheme == "constrained":
+            self.fragment_id_length = balanced_length(header_bytes)
+        else:
+            self.fragment_id_length = header_bytes * 4
         
         # Initialize Reed-Solomon error correction
         if error_correction_level == "none":
@@ -34,166 +71,577 @@ class DNAEncoder:
             self.ecc_symbols = 16
             
         if self.ecc_symbols > 0:
-            self.rs_codec = RSCodec(self.ecc_symbols)
+            self.rs_batch = BatchRSCodec(self.ecc_symbols)
+            self.rs_codec = self.rs_batch.codec
 
     def _binary_to_dna(self, binary_data: bytes) -> str:
         """Convert binary data to DNA sequence using 2-bit encoding."""
-        result = []
-        for byte in binary_data:
-            # Process each byte (8 bits) into 4 nucleotides (2 bits each)
-            for i in range(0, 8, 2):
-                bits = (byte >> (6 - i)) & 0b11
-                result.append(self.NUCLEOTIDES[bits])
-        return ''.join(result)
+        return binary_to_dna(binary_data)
+
+    def _bytes_to_sequence(self, binary_data: bytes) -> str:
+        """Convert binary data to DNA using the configured coding scheme."""
+        if self.coding_scheme == "constrained":
+            return binary_to_balanced_dna(binary_data)
+        return self._binary_to_dna(binary_data)
+
+    def _sequence_to_bytes(self, dna_sequence: str) -> bytes:
+        """Convert DNA back to binary data using the configured coding scheme."""
+        if self.coding_scheme == "constrained":
+            return balanced_dna_to_binary(dna_sequence)
+        return self._dna_to_binary(dna_sequence)
+
+    def _bytes_per_sequence(self) -> int:
+        """Number of data bytes carried by each sequence after the fragment ID."""
+        usable_length = self.base_length - self.fragment_id_length
+        if self.coding_scheme == "constrained":
+            return balanced_capacity(usable_length)
+        return (usable_length * 2) // 8  # 2 bits per nucleotide
+
+    def _gc_flips_needed(self, gc_count: int, length: int, available: int) -> int:
+        """Smallest number of A/T <-> G/C flips that brings GC content within tolerance."""
+        def within(count: int) -> bool:
+            return abs(count / length - self.TARGET_GC_CONTENT) <= self.GC_CONTENT_TOLERANCE
+
+        if gc_count < self.TARGET_GC_CONTENT * length:
+            step = 1
+            estimate = (self.TARGET_GC_CONTENT - self.GC_CONTENT_TOLERANCE) * length - gc_count
+        else:
+            step = -1
+            estimate = gc_count - (self.TARGET_GC_CONTENT + self.GC_CONTENT_TOLERANCE) * length
+
+        # Start just below the closed-form estimate and settle float rounding exactly
+        flips = min(max(int(np.ceil(estimate)) - 1, 1), available)
+        while flips < available and not within(gc_count + step * flips):
+            flips += 1
+        return flips
 
     def _optimize_gc_content(self, sequence: str) -> str:
         """Optimize GC content while maintaining data integrity."""
-        gc_content = (sequence.count('G') + sequence.count('C')) / len(sequence)
-        
+        codes = dna_to_codes(sequence).copy()
+        return codes_to_dna(codes) if self._optimize_gc_codes(codes) else sequence
+
+    def _optimize_gc_codes(self, codes: np.ndarray) -> bool:
+        """Bring the GC content of one strand's 2-bit codes within tolerance in place, returning whether any changed."""
+        length = len(codes)
+        # Codes 0/1 are A/T and 2/3 are C/G, so the high bit selects the class
+        is_gc = codes >= 2
+        gc_count = int(is_gc.sum())
+        gc_content = gc_count / length
+
         if abs(gc_content - self.TARGET_GC_CONTENT) <= self.GC_CONTENT_TOLERANCE:
-            return sequence
-            
-        # Simple optimization: swap some A/T with G/C or vice versa
-        sequence_list = list(sequence)
-        if gc_content < self.TARGET_GC_CONTENT:
-            # Replace some A/T with G/C
-            for i in range(len(sequence_list)):
-                if sequence_list[i] in ['A', 'T']:
-                    sequence_list[i] = 'G' if np.random.random() < 0.5 else 'C'
-                    gc_content = (sequence_list.count('G') + sequence_list.count('C')) / len(sequence_list)
-                    if abs(gc_content - self.TARGET_GC_CONTENT) <= self.GC_CONTENT_TOLERANCE:
-                        break
-        else:
-            # Replace some G/C with A/T
-            for i in range(len(sequence_list)):
-                if sequence_list[i] in ['G', 'C']:
-                    sequence_list[i] = 'A' if np.random.random() < 0.5 else 'T'
-                    gc_content = (sequence_list.count('G') + sequence_list.count('C')) / len(sequence_list)
-                    if abs(gc_content - self.TARGET_GC_CONTENT) <= self.GC_CONTENT_TOLERANCE:
-                        break
-                        
-        return ''.join(sequence_list)
+            return False
+
+        # Flip the leading A/T (or G/C) bases in one pass, swapping as many as needed
+        raise_gc = gc_content < self.TARGET_GC_CONTENT
+        candidates = np.flatnonzero(is_gc != raise_gc)
+        positions = candidates[:self._gc_flips_needed(gc_count, length, len(candidates))]
+
+        coin = (np.random.random(len(positions)) < 0.5).astype(np.uint8)
+        codes[positions] = (0b10 | coin) if raise_gc else (1 - coin)
+        return True
 
     def _avoid_homopolymers(self, sequence: str) -> str:
         """Modify sequence to avoid long runs of the same nucleotide."""
-        result = list(sequence)
-        i = 0
-        while i < len(result) - self.MAX_HOMOPOLYMER_LENGTH:
-            window = result[i:i + self.MAX_HOMOPOLYMER_LENGTH + 1]
-            if len(set(window)) == 1:  # All nucleotides in window are the same
-                alternatives = [n for n in self.NUCLEOTIDES if n != window[0]]
-                result[i + self.MAX_HOMOPOLYMER_LENGTH] = np.random.choice(alternatives)
-            i += 1
-        return ''.join(result)
-
-    def _encrypt_data(self, data: bytes, password: str) -> Tuple[bytes, bytes, bytes]:
-        """Encrypt data using AES-256 with password-based key derivation."""
-        salt = get_random_bytes(16)
-        key = PBKDF2(password.encode(), salt, dkLen=32, count=100000)
+        return self._avoid_homopolymers_batch([sequence])[0]
+
+    def _avoid_homopolymers_batch(self, sequences: List[str]) -> List[str]:
+        """Break up long runs of the same nucleotide in many sequences at once."""
+        lengths = [len(sequence) for sequence in sequences]
+        codes = dna_to_codes(''.join(sequences)).copy()
+        strand_starts = np.cumsum([0] + lengths[:-1])
+        if self._fix_homopolymers(codes, strand_starts) == 0:
+            return sequences
+        text = codes_to_dna(codes)
+        return [text[start:start + length] for start, length in zip(strand_starts.tolist(), lengths)]
+
+    def _find_homopolymers(self, codes: np.ndarray, strand_starts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Locate every run longer than MAX_HOMOPOLYMER_LENGTH in concatenated strands.
+
+        Args:
+            codes: 2-bit codes of the strands, back to back
+            strand_starts: Index in codes where each strand begins (runs never cross strands)
+
+        Returns:
+            Start index and length of each run that is too long
+        """
+        boundaries = np.zeros(len(codes), dtype=bool)
+        boundaries[1:] = np.diff(codes) != 0
+        boundaries[strand_starts[strand_starts < len(codes)]] = True
+        if len(codes):
+            boundaries[0] = True
+        run_starts = np.flatnonzero(boundaries)
+        run_lengths = np.diff(np.append(run_starts, len(codes)))
+        too_long = run_lengths > self.MAX_HOMOPOLYMER_LENGTH
+        return run_starts[too_long], run_lengths[too_long]
+
+    def _fix_homopolymers(self, codes: np.ndarray, strand_starts: np.ndarray) -> int:
+        """
+        Break every run found by _find_homopolymers in place, returning how many bases changed.
+
+        As before, every (MAX_HOMOPOLYMER_LENGTH + 1)-th base of a run is
+        replaced, but the replacement also differs from the base after it so
+        that it never starts a new run.
+        """
+        run_starts, run_lengths = self._find_homopolymers(codes, strand_starts)
+        period = self.MAX_HOMOPOLYMER_LENGTH + 1
+        counts = run_lengths // period
+        total = int(counts.sum())
+        if total == 0:
+            return 0
+
+        # Positions run_start + MAX, + MAX + period, ... within each run
+        first = np.repeat(run_starts + self.MAX_HOMOPOLYMER_LENGTH, counts)
+        nth = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = first + period * nth
+
+        run_base = codes[positions]
+        is_strand_start = np.zeros(len(codes) + 1, dtype=bool)
+        is_strand_start[strand_starts] = True
+        is_strand_start[len(codes)] = True
+        following = np.minimum(positions + 1, len(codes) - 1)
+        right = np.where(is_strand_start[positions + 1], run_base, codes[following])
+
+        # Draw uniformly from the codes that differ from both the run base and its right neighbour
+        low = np.minimum(run_base, right)
+        high = np.maximum(run_base, right)
+        choices = np.where(low == high, 3, 2)
+        replacement = (np.random.random(total) * choices).astype(np.uint8)
+        replacement += replacement >= low
+        replacement += (replacement >= high) & (low != high)
+        codes[positions] = replacement
+        return total
+
+    def _derive_key(self, password: Password, salt: bytes) -> bytes:
+        """Derive the AES-256 key for a password (or session subkey) and salt."""
+        if isinstance(password, KeySession):
+            return password.subkey(salt)
+        return derive_key(password, salt)
+
+    def _encrypt_with_key(self, data: bytes, key: bytes) -> Tuple[bytes, bytes]:
+        """Encrypt data with an already derived key, returning ciphertext and nonce."""
         cipher = AES.new(key, AES.MODE_GCM)
         ciphertext, tag = cipher.encrypt_and_digest(data)
-        return ciphertext, cipher.nonce, salt
+        return ciphertext, cipher.nonce
+
+    def _encrypt_data(self, data: bytes, password: Password) -> Tuple[bytes, bytes, bytes]:
+        """Encrypt data using AES-256 with password-based key derivation."""
+        salt = get_random_bytes(16)
+        ciphertext, nonce = self._encrypt_with_key(data, self._derive_key(password, salt))
+        return ciphertext, nonce, salt
 
-    def _add_fragment_id(self, sequence: str, fragment_id: int) -> str:
-        """Add a fragment identifier to the sequence."""
-        id_binary = format(fragment_id, '016b')
-        id_dna = self._binary_to_dna(int(id_binary, 2).to_bytes(2, byteorder='big'))
+    def _add_fragment_id(self, sequence: str, fragment_id: int, object_id: int = 0) -> str:
+        """Add the object and fragment identifiers to the sequence."""
+        if fragment_id >= 1 << self.address_bits:
+            raise ValueError(f"Fragment ID {fragment_id} exceeds the {self.address_bits}-bit address space")
+        if object_id >= 1 << self.object_id_bits:
+            raise ValueError(f"Object ID {object_id} exceeds the {self.object_id_bits}-bit object ID field")
+        header = (object_id << self.address_bits) | fragment_id
+        id_dna = self._bytes_to_sequence(header.to_bytes((self.object_id_bits + self.address_bits) // 8,
+                                                         byteorder='big'))
         return id_dna + sequence
 
-    def encode(self, data: bytes, password: Optional[str] = None) -> List[str]:
+    def _fragment_headers(self, first_fragment_id: int, count: int, object_id: int = 0) -> np.ndarray:
+        """Big-endian object and fragment ID bytes of count consecutive fragments, one row each."""
+        header_bytes = (self.object_id_bits + self.address_bits) // 8
+        headers = (np.arange(first_fragment_id, first_fragment_id + count, dtype=np.uint64)
+                   | np.uint64(object_id << self.address_bits))
+        shifts = np.arange(8 * (header_bytes - 1), -1, -8, dtype=np.uint64)
+        return ((headers[:, None] >> shifts) & np.uint64(0xFF)).astype(np.uint8)
+
+    def _check_address_space(self, fragment_count: int, object_id: int = 0) -> None:
+        """Raise ValueError before any encoding work if the fragments or object ID do not fit their ID fields."""
+        if fragment_count > 1 << self.address_bits:
+            raise ValueError(f"{fragment_count} fragments exceed the {self.address_bits}-bit address space")
+        if object_id >= 1 << self.object_id_bits:
+            raise ValueError(f"Object ID {object_id} exceeds the {self.object_id_bits}-bit object ID field")
+
+    def _config(self) -> dict:
+        """Constructor arguments needed to rebuild this encoder in a worker process."""
+        return {
+            "base_length": self.base_length,
+            "error_correction_level": self.error_correction_level,
+            "coding_scheme": self.coding_scheme,
+            "address_bits": self.address_bits,
+            "object_id_bits": self.object_id_bits,
+        }
+
+    def encode(self, data: bytes, password: Optional[Password] = None, workers: int = 1,
+               object_id: int = 0, packed: bool = False) -> Union[List[str], PackedStrands]:
         """
         Encode binary data into DNA sequences.
         
         Args:
             data: Binary data to encode
-            password: Optional password for encryption
+            password: Optional password (or KeySession) for encryption
+            workers: Number of worker processes to spread chunks across
+            object_id: Object ID written before every fragment ID (needs object_id_bits)
+            packed: Return the sequences as PackedStrands (2 bits per base) instead of strings
             
         Returns:
-            List of DNA sequences
+            List of DNA sequences, or PackedStrands if packed is set
         """
         if password:
             data, nonce, salt = self._encrypt_data(data, password)
             # Prepend encryption metadata to data
             data = salt + nonce + data
 
-        # Calculate how many nucleotides we can fit in each sequence
-        usable_length = self.base_length - 8  # Reserve 8 nucleotides for fragment ID
-        bytes_per_sequence = (usable_length * 2) // 8  # 2 bits per nucleotide
+        self._check_address_space(-(-len(data) // self._bytes_per_sequence()), object_id)
+        if workers > 1:
+            return self._encode_chunks_parallel(data, workers, object_id, packed)
+        return self._encode_chunks(data, object_id=object_id, packed=packed)
+
+    def encode_many(self, files: Iterable[Tuple[str, bytes]],
+                    password: Optional[Password] = None) -> Tuple[Dict[str, List[str]], List[dict]]:
+        """
+        Encode many files in one call, sharing codec state and key derivation.
+
+        When a password is given the key is derived once for the whole batch
+        (one salt, a fresh nonce per file), so PBKDF2 runs once instead of
+        once per file. Each file decodes on its own with decode(). With
+        object_id_bits set, each file also gets its position in the batch as
+        object ID, so the combined pool can be decoded per file with
+        decode(pool, object_id=...).
+
+        Args:
+            files: Iterable of (name, data) pairs
+            password: Optional password (or KeySession) for encryption
+
+        Returns:
+            Tuple of the DNA sequences per file name, and an index with one
+            entry per file giving its name, object_id, size, sequence_count
+            and first_sequence (its offset in the combined sequence pool)
+        """
+        if password:
+            salt = get_random_bytes(16)
+            key = self._derive_key(password, salt)
+
+        sequences = {}
+        index = []
+        first_sequence = 0
+        for name, data in files:
+            if name in sequences:
+                raise ValueError(f"Duplicate file name in batch: {name}")
+
+            size = len(data)
+            if password:
+                ciphertext, nonce = self._encrypt_with_key(data, key)
+                data = salt + nonce + ciphertext
+
+            object_id = len(index) if self.object_id_bits else 0
+            sequences[name] = self._encode_chunks(data, object_id=object_id)
+            index.append({
+                "name": name,
+                "object_id": object_id,
+                "size": size,
+                "sequence_count": len(sequences[name]),
+                "first_sequence": first_sequence,
+            })
+            first_sequence += len(sequences[name])
+
+        return sequences, index
+
+    def _encode_chunks(self, data: bytes, start: int = 0, stop: Optional[int] = None,
+                       first_fragment_id: int = 0, object_id: int = 0,
+                       packed: bool = False) -> Union[List[str], PackedStrands]:
+        """
+        Split (already encrypted) data into chunks and encode each as a tagged sequence.
+
+        start and stop select a range of chunk indices; each chunk's fragment
+        ID is first_fragment_id plus its index in data, so ranges can be
+        encoded independently and concatenated. With packed set the strands
+        are returned as PackedStrands; the binary scheme then never builds strings.
+        """
+        # Calculate how many bytes we can fit in each sequence
+        bytes_per_sequence = self._bytes_per_sequence()
+        if stop is None:
+            stop = -(-len(data) // bytes_per_sequence)
+        self._check_address_space(first_fragment_id + stop, object_id)
 
         # Split data into chunks
-        sequences = []
-        for i in range(0, len(data), bytes_per_sequence):
-            chunk = data[i:i + bytes_per_sequence]
-            
-            # Convert to DNA sequence
-            dna_sequence = self._binary_to_dna(chunk)
-            
-            # Apply error correction if enabled
-            if self.ecc_symbols > 0:
-                dna_sequence = self._binary_to_dna(self.rs_codec.encode(chunk))
-            
-            # Optimize sequence
-            dna_sequence = self._optimize_gc_content(dna_sequence)
-            dna_sequence = self._avoid_homopolymers(dna_sequence)
-            
-            # Add fragment ID
-            dna_sequence = self._add_fragment_id(dna_sequence, len(sequences))
-            
-            sequences.append(dna_sequence)
-            
-        return sequences
+        chunks = [bytes(data[fragment_id * bytes_per_sequence:(fragment_id + 1) * bytes_per_sequence])
+                  for fragment_id in range(start, stop)]
+
+        # Apply error correction to all chunks at once if enabled
+        if self.ecc_symbols > 0:
+            chunks = self.rs_batch.encode(chunks)
+
+        if self.coding_scheme == "constrained":
+            # The constrained code satisfies GC and homopolymer limits by construction
+            sequences = [
+                self._add_fragment_id(self._bytes_to_sequence(chunk), first_fragment_id + fragment_id, object_id)
+                for fragment_id, chunk in zip(range(start, stop), chunks)
+            ]
+            return PackedStrands.from_strings(sequences) if packed else sequences
+
+        strands = self._encode_binary_chunks(chunks, first_fragment_id + start, object_id)
+        return strands if packed else strands.to_strings()
+
+    def _encode_binary_chunks(self, chunks: List[bytes], first_fragment_id: int, object_id: int = 0) -> PackedStrands:
+        """
+        Turn error-corrected chunks into packed binary-scheme strands.
+
+        GC balancing and homopolymer fixing run on the 2-bit codes of all
+        bodies at once. Each body stays a whole number of bytes, so the packed
+        strand is just the ID header bytes followed by the body bytes.
+        """
+        if not chunks:
+            return PackedStrands(np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.int64))
+        body_bytes = np.fromiter(map(len, chunks), dtype=np.int64, count=len(chunks))
+        strand_starts = np.zeros(len(chunks), dtype=np.int64)
+        np.cumsum(4 * body_bytes[:-1], out=strand_starts[1:])
+
+        codes = bytes_to_codes(b''.join(chunks))
+        for begin, length in zip(strand_starts.tolist(), (4 * body_bytes).tolist()):
+            self._optimize_gc_codes(codes[begin:begin + length])
+        self._fix_homopolymers(codes, strand_starts)
+
+        # Interleave the ID header bytes and the body bytes of every strand
+        headers = self._fragment_headers(first_fragment_id, len(chunks), object_id)
+        header_bytes = headers.shape[1]
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        np.cumsum(header_bytes + body_bytes, out=offsets[1:])
+        data = np.empty(offsets[-1], dtype=np.uint8)
+        is_body = np.ones(offsets[-1], dtype=bool)
+        header_positions = offsets[:-1, None] + np.arange(header_bytes)
+        data[header_positions] = headers
+        is_body[header_positions] = False
+        data[is_body] = np.frombuffer(codes_to_bytes(codes), dtype=np.uint8)
+        return PackedStrands(data, 4 * (header_bytes + body_bytes))
+
+    def encode_stream(self, fileobj: BinaryIO, chunk_bytes: int = 1 << 20,
+                      password: Optional[Password] = None, object_id: int = 0) -> Iterator[str]:
+        """
+        Encode a file-like object into DNA sequences incrementally.
+
+        Produces the same sequences as encode(fileobj.read(), password) but
+        only ever holds about chunk_bytes of input, so memory stays bounded
+        regardless of the input size.
+
+        Args:
+            fileobj: Binary file-like object to read from
+            chunk_bytes: Approximate number of bytes to read and encode at a time
+            password: Optional password (or KeySession) for encryption
+            object_id: Object ID written before every fragment ID (needs object_id_bits)
+
+        Yields:
+            DNA sequences in fragment ID order
+        """
+        bytes_per_sequence = self._bytes_per_sequence()
+        # Read whole sequences' worth at a time so chunk boundaries match encode()
+        window = max(1, chunk_bytes // bytes_per_sequence) * bytes_per_sequence
+
+        # Check the address space up front when the input size is known (seekable files);
+        # otherwise _encode_chunks checks each window before encoding it
+        if getattr(fileobj, 'seekable', lambda: False)():
+            position = fileobj.tell()
+            remaining = fileobj.seek(0, 2) - position
+            fileobj.seek(position)
+            if password:
+                remaining += 32  # salt and nonce
+            self._check_address_space(-(-remaining // bytes_per_sequence), object_id)
+        else:
+            self._check_address_space(0, object_id)
+
+        pending = b''
+        cipher = None
+        if password:
+            salt = get_random_bytes(16)
+            cipher = AES.new(self._derive_key(password, salt), AES.MODE_GCM)
+            # Prepend encryption metadata to data
+            pending = salt + cipher.nonce
+
+        fragment_id = 0
+        while True:
+            block = fileobj.read(window)
+            if not block:
+                break
+            if cipher:
+                block = cipher.encrypt(block)
+            pending += block
+
+            full = len(pending) - len(pending) % bytes_per_sequence
+            for sequence in self._encode_chunks(pending[:full], first_fragment_id=fragment_id,
+                                                object_id=object_id):
+                yield sequence
+            fragment_id += full // bytes_per_sequence
+            pending = pending[full:]
+
+        for sequence in self._encode_chunks(pending, first_fragment_id=fragment_id, object_id=object_id):
+            yield sequence
+
+    def _encode_chunks_parallel(self, data: bytes, workers: int, object_id: int = 0,
+                                packed: bool = False) -> Union[List[str], PackedStrands]:
+        """Encode chunk ranges across a process pool reading from one shared-memory buffer."""
+        total_chunks = -(-len(data) // self._bytes_per_sequence())
+        self._check_address_space(total_chunks, object_id)
+        if total_chunks < 2:
+            return self._encode_chunks(data, object_id=object_id, packed=packed)
+
+        # A few ranges per worker keeps the pool busy when ranges finish unevenly
+        step = max(1, -(-total_chunks // (workers * 4)))
+        starts = list(range(0, total_chunks, step))
+        stops = [min(start + step, total_chunks) for start in starts]
+
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            shm.buf[:len(data)] = data
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_encode_worker,
+                                     initargs=(self._config(), shm.name, len(data), object_id)) as pool:
+                parts = list(pool.map(_encode_worker_range, starts, stops, repeat(packed)))
+        finally:
+            shm.close()
+            shm.unlink()
+        if packed:
+            return PackedStrands.concatenate(parts)
+        return [sequence for part in parts for sequence in part]
 
     def _dna_to_binary(self, dna_sequence: str) -> bytes:
         """Convert DNA sequence back to binary data."""
-        result = bytearray()
-        current_byte = 0
-        bit_count = 0
-        
-        for nucleotide in dna_sequence:
-            bits = self.NUCLEOTIDES.index(nucleotide)
-            current_byte = (current_byte << 2) | bits
-            bit_count += 2
-            
-            if bit_count == 8:
-                result.append(current_byte)
-                current_byte = 0
-                bit_count = 0
-                
-        return bytes(result)
+        return dna_to_binary(dna_sequence)
+
+    def _extract_addresses(self, sequences: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the object and fragment IDs of every sequence in one vectorized pass."""
+        if not sequences:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+        id_length = self.fragment_id_length
+        prefixes = ''.join(sequence[:id_length] for sequence in sequences)
+        if len(prefixes) != id_length * len(sequences):
+            raise ValueError("Sequence too short to hold a fragment ID")
+
+        codes = dna_to_codes(prefixes).reshape(len(sequences), id_length)
+        if self.coding_scheme == "constrained":
+            bits = balanced_codes_to_bits(codes)
+        else:
+            bits = codes_to_bits(codes)
+        id_bits = self.object_id_bits + self.address_bits
+        weights = np.uint64(1) << np.arange(id_bits - 1, -1, -1, dtype=np.uint64)
+        return self._split_headers(bits[:, :id_bits].astype(np.uint64) @ weights)
+
+    def _extract_packed_addresses(self, strands: PackedStrands) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the object and fragment IDs of binary-scheme strands straight from their packed header bytes."""
+        if len(strands) and strands.lengths.min() < self.fragment_id_length:
+            raise ValueError("Sequence too short to hold a fragment ID")
+        header_bytes = self.fragment_id_length // 4
+        header_rows = strands.data[strands.offsets[:-1, None] + np.arange(header_bytes)]
+        weights = np.uint64(1) << np.arange(8 * (header_bytes - 1), -1, -8, dtype=np.uint64)
+        return self._split_headers(header_rows.astype(np.uint64) @ weights)
+
+    def _split_headers(self, headers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Split combined uint64 headers into object IDs and fragment IDs."""
+        address_mask = np.uint64((1 << self.address_bits) - 1)
+        return headers >> np.uint64(self.address_bits), headers & address_mask
+
+    def _fragment_order(self, object_ids: np.ndarray, fragment_ids: np.ndarray,
+                        object_id: Optional[int] = None) -> List[int]:
+        """
+        Indices of the sequences in fragment ID order, grouping by ID in O(n).
+
+        Sequences sharing an ID stay in input order, matching a stable sort.
+        If object_id is given, sequences of other objects are left out.
+        """
+        keep = object_ids == object_id if object_id is not None else np.ones(len(fragment_ids), dtype=bool)
+        buckets: Dict[int, List[int]] = {}
+        for index, (fragment_id, wanted) in enumerate(zip(fragment_ids.tolist(), keep.tolist())):
+            if wanted:
+                buckets.setdefault(fragment_id, []).append(index)
+        if not buckets:
+            return []
+
+        # IDs are dense chunk indices, so walking the ID range avoids sorting
+        max_id = max(buckets)
+        if max_id < 2 * len(buckets):
+            ids = [fragment_id for fragment_id in range(max_id + 1) if fragment_id in buckets]
+        else:
+            ids = sorted(buckets)
+        return [index for fragment_id in ids for index in buckets[fragment_id]]
+
+    def _decode_bodies(self, sequences: List[str]) -> List[bytes]:
+        """Strip fragment IDs and decode/error-correct each sequence to its data chunk."""
+        # Remove fragment IDs
+        return self._decode_codewords([self._sequence_to_bytes(sequence[self.fragment_id_length:])
+                                       for sequence in sequences])
+
+    def _decode_codewords(self, chunks: List[bytes]) -> List[bytes]:
+        """Error-correct the body bytes of each sequence to its data chunk."""
+        # Apply error correction to all chunks at once if enabled
+        if self.ecc_symbols > 0:
+            try:
+                chunks = self.rs_batch.decode(chunks)
+            except:
+                raise ValueError(f"Error correction failed for sequence")
+        return chunks
+
+    def _decode_bodies_parallel(self, sequences: Union[List[str], List[bytes]], workers: int,
+                                codewords: bool = False) -> List[bytes]:
+        """
+        Run _decode_bodies over slices of sequences on a process pool, keeping order.
+
+        With codewords set the items are body bytes, decoded with _decode_codewords.
+        """
+        step = max(1, -(-len(sequences) // (workers * 4)))
+        batches = [sequences[i:i + step] for i in range(0, len(sequences), step)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_decode_worker,
+                                 initargs=(self._config(),)) as pool:
+            chunks = []
+            for part, stats in pool.map(_decode_worker_batch, batches, repeat(codewords)):
+                chunks.extend(part)
+                # Fold the worker's error correction counters into ours
+                for name, count in stats.items():
+                    setattr(self.rs_batch, name, getattr(self.rs_batch, name) + count)
+            return chunks
 
-    def decode(self, sequences: List[str], password: Optional[str] = None) -> bytes:
+    def ecc_stats(self) -> Dict[str, int]:
+        """
+        Count sequences decoded so far by error correction outcome.
+
+        Returns:
+            Dict with the number of sequences that were clean (passed the
+            syndrome check), corrected, and failed (too many errors); all zero
+            when error correction is disabled
+        """
+        if self.ecc_symbols == 0:
+            return {"clean": 0, "corrected": 0, "failed": 0}
+        return self.rs_batch.stats()
+
+    def decode(self, sequences: Union[List[str], PackedStrands], password: Optional[Password] = None,
+               workers: int = 1, object_id: Optional[int] = None) -> bytes:
         """
         Decode DNA sequences back to binary data.
         
         Args:
-            sequences: List of DNA sequences
-            password: Optional password for decryption
+            sequences: List of DNA sequences, or PackedStrands
+            password: Optional password (or KeySession) for decryption
+            workers: Number of worker processes to spread error correction across
+            object_id: Only decode sequences carrying this object ID (for multi-file pools)
             
         Returns:
             Original binary data
         """
-        # Sort sequences by fragment ID
-        def extract_fragment_id(seq):
-            id_dna = seq[:8]
-            id_binary = self._dna_to_binary(id_dna)
-            return int.from_bytes(id_binary, byteorder='big')
-            
-        sequences = sorted(sequences, key=extract_fragment_id)
-        
+        codewords = isinstance(sequences, PackedStrands) and self.coding_scheme == "binary"
+        if codewords:
+            # The ID header is whole bytes, so each strand's packed bytes after it are its body as is
+            header_bytes = self.fragment_id_length // 4
+            order = self._fragment_order(*self._extract_packed_addresses(sequences), object_id)
+            lengths = sequences.lengths.tolist()
+            items = [bytes(sequences.packed(i)[header_bytes:lengths[i] // 4]) for i in order]
+        else:
+            if isinstance(sequences, PackedStrands):
+                # The constrained code is not byte aligned, so it is decoded from strings
+                sequences = sequences.to_strings()
+
+            # Order sequences by fragment ID
+            order = self._fragment_order(*self._extract_addresses(sequences), object_id)
+            items = [sequences[i] for i in order]
+
         # Remove fragment IDs and concatenate data
-        data = bytearray()
-        for sequence in sequences:
-            sequence = sequence[8:]  # Remove fragment ID
-            chunk = self._dna_to_binary(sequence)
-            
-            # Apply error correction if enabled
-            if self.ecc_symbols > 0:
-                try:
-                    chunk = self.rs_codec.decode(chunk)[0]
-                except:
-                    raise ValueError(f"Error correction failed for sequence")
-                    
-            data.extend(chunk)
+        if workers > 1 and len(items) > 1:
+            chunks = self._decode_bodies_parallel(items, workers, codewords)
+        elif codewords:
+            chunks = self._decode_codewords(items)
+        else:
+            chunks = self._decode_bodies(items)
+        data = bytearray(b''.join(chunks))
             
         if password:
             # Extract encryption metadata
@@ -202,11 +650,146 @@ class DNAEncoder:
             ciphertext = data[32:]
             
             # Decrypt data
-            key = PBKDF2(password.encode(), salt, dkLen=32, count=100000)
+            key = self._derive_key(password, bytes(salt))
             cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
             try:
                 data = cipher.decrypt(ciphertext)
             except:
                 raise ValueError("Decryption failed - incorrect password")
                 
-        return bytes(data) 
\ No newline at end of file
+        return bytes(data)
+
+    def decode_stream(self, sequences: Iterable[str], sink: BinaryIO, password: Optional[Password] = None,
+                      batch_size: int = 1024, window: int = 1 << 20,
+                      object_id: Optional[int] = None, expected_fragments: Optional[int] = None) -> dict:
+        """
+        Decode DNA sequences arriving in any order straight into a seekable sink.
+
+        Each recovered chunk is written at its offset (fragment ID times the
+        chunk size), so only batch_size sequences are held at a time. With a
+        password the sink must also be readable: the ciphertext is decrypted
+        in place afterwards, window bytes at a time.
+
+        Fragment IDs are not covered by error correction, so a damaged ID can
+        point anywhere in the address space. IDs at or beyond expected_fragments
+        (MAX_STREAM_FRAGMENTS if not given) are counted as out of range and
+        skipped rather than growing the received map or seeking the sink there.
+
+        Args:
+            sequences: Iterable of DNA sequences in any order
+            sink: Seekable binary file-like object (or mmap) to write into
+            password: Optional password (or KeySession) for decryption
+            batch_size: Number of sequences decoded per vectorized batch
+            window: Number of bytes decrypted at a time
+            object_id: Only decode sequences carrying this object ID (for multi-file pools)
+            expected_fragments: Number of fragments the object was encoded into, if known
+
+        Returns:
+            Dict with the decoded size, the number of fragments written, the
+            number of duplicate fragments skipped, the number of sequences with
+            out-of-range fragment IDs, the missing fragment IDs and the
+            clean/corrected/failed error correction counts for this call
+        """
+        bytes_per_sequence = self._bytes_per_sequence()
+        fragment_limit = min(expected_fragments if expected_fragments is not None else self.MAX_STREAM_FRAGMENTS,
+                             1 << self.address_bits)
+        stats_before = self.ecc_stats()
+        received = bytearray()  # one flag per fragment ID
+        fragments = duplicates = out_of_range = size = 0
+
+        iterator = iter(sequences)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+
+            object_ids, fragment_ids = self._extract_addresses(batch)
+            if object_id is not None:
+                wanted = (object_ids == object_id).tolist()
+                batch = [sequence for sequence, keep in zip(batch, wanted) if keep]
+                fragment_ids = fragment_ids[object_ids == object_id]
+            in_range = fragment_ids < fragment_limit
+            out_of_range += int((~in_range).sum())
+            batch = [sequence for sequence, keep in zip(batch, in_range.tolist()) if keep]
+            fragment_ids = fragment_ids[in_range]
+            for fragment_id, chunk in zip(fragment_ids.tolist(), self._decode_bodies(batch)):
+                if fragment_id >= len(received):
+                    received.extend(bytes(fragment_id + 1 - len(received)))
+                if received[fragment_id]:
+                    duplicates += 1
+                    continue
+                received[fragment_id] = 1
+                fragments += 1
+
+                offset = fragment_id * bytes_per_sequence
+                sink.seek(offset)
+                sink.write(chunk)
+                size = max(size, offset + len(chunk))
+
+        if expected_fragments is not None and len(received) < fragment_limit:
+            received.extend(bytes(fragment_limit - len(received)))
+        if password and size >= 32:
+            size = self._decrypt_in_place(sink, size, password, window)
+        if hasattr(sink, 'truncate'):
+            sink.truncate(size)
+
+        return {
+            "size": size,
+            "fragments": fragments,
+            "duplicates": duplicates,
+            "out_of_range": out_of_range,
+            "missing": [fragment_id for fragment_id, seen in enumerate(received) if not seen],
+            **{name: count - stats_before[name] for name, count in self.ecc_stats().items()},
+        }
+
+    def _decrypt_in_place(self, sink: BinaryIO, size: int, password: Password, window: int) -> int:
+        """Decrypt salt + nonce + ciphertext held in sink, shifting the plaintext to offset 0."""
+        sink.seek(0)
+        salt = sink.read(16)
+        nonce = sink.read(16)
+        cipher = AES.new(self._derive_key(password, salt), AES.MODE_GCM, nonce=nonce)
+
+        for position in range(0, size - 32, window):
+            sink.seek(32 + position)
+            block = sink.read(min(window, size - 32 - position))
+            sink.seek(position)
+            sink.write(cipher.decrypt(block))
+        return size - 32
+
+
+# Per-process state for DNAEncoder's encode/decode pool workers
+_worker_encoder: Optional[DNAEncoder] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_size = 0
+_worker_object_id = 0
+
+
+def _init_encode_worker(config: dict, shm_name: str, size: int, object_id: int = 0) -> None:
+    """Build the worker's encoder and attach to the shared input buffer."""
+    global _worker_encoder, _worker_shm, _worker_size, _worker_object_id
+    _worker_encoder = DNAEncoder(**config)
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_size = size
+    _worker_object_id = object_id
+
+
+def _init_decode_worker(config: dict) -> None:
+    """Build the worker's encoder for decoding."""
+    global _worker_encoder
+    _worker_encoder = DNAEncoder(**config)
+
+
+def _decode_worker_batch(sequences: Union[List[str], List[bytes]],
+                         codewords: bool = False) -> Tuple[List[bytes], Dict[str, int]]:
+    """Decode one batch of fragment-ordered sequences (or body bytes), returning its error correction counters too."""
+    decode = _worker_encoder._decode_codewords if codewords else _worker_encoder._decode_bodies
+    if _worker_encoder.ecc_symbols == 0:
+        return decode(sequences), {}
+    _worker_encoder.rs_batch.reset_stats()
+    return decode(sequences), _worker_encoder.rs_batch.stats()
+
+
+def _encode_worker_range(start: int, stop: int, packed: bool = False) -> Union[List[str], PackedStrands]:
+    """Encode chunks start..stop of the shared input buffer."""
+    return _worker_encoder._encode_chunks(_worker_shm.buf[:_worker_size], start, stop,
+                                          object_id=_worker_object_id, packed=packed)
@@ -0,0 +1,137 @@
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+import struct
+import numpy as np
+from .codec import BytesLike, binary_to_dna, bytes_to_codes, dna_to_binary
+
+_BLOCK_HEADER = struct.Struct('<4sI')
+
+
+class PackedStrands:
+    """
+    Many DNA strands stored as 2-bit codes in one contiguous uint8 buffer.
+
+    Each strand starts on a byte boundary and takes ceil(length / 4) bytes,
+    using the same code as codec.binary_to_dna (A=0, T=1, C=2, G=3, most
+    significant bit pair first); a final partial byte is padded with A.
+    `offsets[i]:offsets[i + 1]` is the byte range of strand i and `lengths[i]`
+    its length in bases. Slicing returns views of the same buffer.
+    """
+
+    MAGIC = b'DNAP'
+
+    def __init__(self, data: np.ndarray, lengths: np.ndarray):
+        """
+        Wrap an existing packed buffer.
+
+        Args:
+            data: uint8 buffer holding the packed strands back to back
+            lengths: Length of every strand in bases
+        """
+        self.data = np.asarray(data, dtype=np.uint8).view()
+        self.data.flags.writeable = False
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.offsets = np.zeros(len(self.lengths) + 1, dtype=np.int64)
+        np.cumsum((self.lengths + 3) // 4, out=self.offsets[1:])
+        if self.offsets[-1] != len(self.data):
+            raise ValueError("Packed buffer size does not match strand lengths")
+
+    @classmethod
+    def from_strings(cls, sequences: Iterable[str]) -> "PackedStrands":
+        """Pack nucleotide strings."""
+        sequences = list(sequences)
+        lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+        padded = ''.join(sequence + 'A' * (-len(sequence) % 4) for sequence in sequences)
+        return cls(np.frombuffer(dna_to_binary(padded), dtype=np.uint8), lengths)
+
+    @classmethod
+    def from_packed(cls, strands: Iterable[BytesLike], lengths: Optional[Iterable[int]] = None) -> "PackedStrands":
+        """Join already packed strands (e.g. the output of codec.dna_to_binary); lengths default to 4 bases per byte."""
+        strands = [bytes(strand) for strand in strands]
+        if lengths is None:
+            lengths = [4 * len(strand) for strand in strands]
+        return cls(np.frombuffer(b''.join(strands), dtype=np.uint8), np.fromiter(lengths, dtype=np.int64))
+
+    @classmethod
+    def concatenate(cls, parts: Iterable["PackedStrands"]) -> "PackedStrands":
+        """Join PackedStrands end to end into one buffer."""
+        parts = list(parts)
+        if not parts:
+            return cls(np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.int64))
+        return cls(np.concatenate([part.data for part in parts]), np.concatenate([part.lengths for part in parts]))
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "PackedStrands"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                stop = max(start, stop)
+                return PackedStrands(self.data[self.offsets[start]:self.offsets[stop]], self.lengths[start:stop])
+            indices = range(start, stop, step)
+            return PackedStrands.from_packed((self.packed(i) for i in indices), self.lengths[index])
+        return binary_to_dna(self.packed(index))[:self.lengths[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_strings())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedStrands):
+            return NotImplemented
+        return np.array_equal(self.lengths, other.lengths) and np.array_equal(self.data, other.data)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the buffer and index arrays."""
+        return self.data.nbytes + self.lengths.nbytes + self.offsets.nbytes
+
+    def packed(self, index: int) -> memoryview:
+        """Read-only view of one strand's packed bytes; bytes() of it makes a compact dict key."""
+        if index < 0:
+            index += len(self)
+        return memoryview(self.data[self.offsets[index]:self.offsets[index + 1]])
+
+    def codes(self, index: int) -> np.ndarray:
+        """2-bit codes of one strand."""
+        return bytes_to_codes(self.packed(index))[:self.lengths[index]]
+
+    def to_strings(self) -> List[str]:
+        """Unpack every strand to a nucleotide string."""
+        text = binary_to_dna(self.data.tobytes())
+        return [text[4 * offset:4 * offset + length]
+                for offset, length in zip(self.offsets[:-1].tolist(), self.lengths.tolist())]
+
+    def tobytes(self) -> bytes:
+        """Serialize as one block: magic, strand count, uint32 lengths, packed data."""
+        return (_BLOCK_HEADER.pack(self.MAGIC, len(self))
+                + self.lengths.astype('<u4').tobytes() + self.data.tobytes())
+
+    @classmethod
+    def frombytes(cls, buffer: BytesLike) -> "PackedStrands":
+        """Load one block written by tobytes(), viewing the buffer without copying the data."""
+        magic, count = _BLOCK_HEADER.unpack_from(buffer)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a packed strand block")
+        lengths = np.frombuffer(buffer, dtype='<u4', count=count, offset=_BLOCK_HEADER.size)
+        start = _BLOCK_HEADER.size + 4 * count
+        return cls(np.frombuffer(buffer, dtype=np.uint8, offset=start), lengths.astype(np.int64))
+
+    @classmethod
+    def read(cls, fileobj: BinaryIO) -> Optional["PackedStrands"]:
+        """Read the next block from a stream of concatenated blocks, or None at the end."""
+        header = fileobj.read(_BLOCK_HEADER.size)
+        if not header:
+            return None
+        if len(header) < _BLOCK_HEADER.size:
+            raise ValueError("Truncated packed strand block")
+        magic, count = _BLOCK_HEADER.unpack(header)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a packed strand block")
+        lengths = np.frombuffer(fileobj.read(4 * count), dtype='<u4').astype(np.int64)
+        if len(lengths) < count:
+            raise ValueError("Truncated packed strand block")
+        size = int(((lengths + 3) // 4).sum())
+        data = fileobj.read(size)
+        if len(data) < size:
+            raise ValueError("Truncated packed strand block")
+        return cls(np.frombuffer(data, dtype=np.uint8), lengths)
@@ -0,0 +1,170 @@
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from reedsolo import RSCodec, ReedSolomonError
+
+# GF(2^8) with the primitive polynomial and generator reedsolo uses by default
+PRIMITIVE_POLYNOMIAL = 0x11d
+FIELD_SIZE = 255
+
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Multiplication table and powers of the generator in GF(2^8)."""
+    exp = np.zeros(2 * FIELD_SIZE, dtype=np.int64)
+    log = np.zeros(256, dtype=np.int64)
+    x = 1
+    for i in range(FIELD_SIZE):
+        exp[i] = x
+        log[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= PRIMITIVE_POLYNOMIAL
+    exp[FIELD_SIZE:] = exp[:FIELD_SIZE]
+    mul = exp[log[:, None] + log[None, :]].astype(np.uint8)
+    mul[0, :] = 0
+    mul[:, 0] = 0
+    return mul, exp[:FIELD_SIZE].astype(np.uint8)
+
+
+_GF_MUL, _GF_EXP = _build_tables()
+
+
+class BatchRSCodec:
+    """
+    Reed-Solomon codec that works on many messages at once, byte-compatible with reedsolo.RSCodec(nsym).
+
+    Codewords are processed as 2-D uint8 arrays, one row per message, with
+    per-position lookup tables, so the Python loop runs over byte positions
+    rather than over messages. Decoding computes syndromes for the whole
+    batch first; rows whose syndromes are all zero are valid codewords and
+    are returned without error location. Only the rest go through reedsolo.
+    The clean, corrected and failed attributes count decoded codewords.
+    """
+
+    def __init__(self, nsym: int, nsize: int = FIELD_SIZE):
+        """
+        Initialize the codec.
+
+        Args:
+            nsym: Number of ECC symbols per block
+            nsize: Block size (message + ECC), as in reedsolo
+        """
+        self.nsym = nsym
+        self.nsize = nsize
+        self.block_data = nsize - nsym
+        self.codec = RSCodec(nsym, nsize=nsize)
+        self.clean = 0
+        self.corrected = 0
+        self.failed = 0
+
+        # Generator polynomial prod(x - a^i), highest degree first
+        generator = np.array([1], dtype=np.uint8)
+        for i in range(nsym):
+            shifted = np.append(generator, 0)
+            shifted[1:] ^= _GF_MUL[generator, _GF_EXP[i]]
+            generator = shifted
+
+        # Row d holds x^(d + nsym) mod g: the parity contributed by a message byte 1 at degree d
+        remainders = np.zeros((self.block_data, nsym), dtype=np.uint8)
+        remainder = generator[1:].copy()
+        for degree in range(self.block_data):
+            remainders[degree] = remainder
+            top = remainder[0]
+            remainder = np.append(remainder[1:], 0) ^ _GF_MUL[top, generator[1:]]
+        # _parity_table[d][b] = parity of byte b at degree d
+        self._parity_table = _GF_MUL[:, remainders].transpose(1, 0, 2)
+
+        # _syndrome_table[d][b] = b * a^(j*d) for each syndrome j
+        powers = _GF_EXP[(np.arange(nsize)[:, None] * np.arange(nsym)[None, :]) % FIELD_SIZE]
+        self._syndrome_table = _GF_MUL[:, powers].transpose(1, 0, 2)
+
+    def encode_array(self, messages: np.ndarray) -> np.ndarray:
+        """Append ECC to each row of an (n, k) uint8 array with k <= nsize - nsym."""
+        length = messages.shape[1]
+        parity = np.zeros((len(messages), self.nsym), dtype=np.uint8)
+        for i in range(length):
+            parity ^= self._parity_table[length - 1 - i][messages[:, i]]
+        return np.concatenate([messages, parity], axis=1)
+
+    def syndromes(self, codewords: np.ndarray) -> np.ndarray:
+        """Syndromes of each row of an (n, m) uint8 array with m <= nsize; all zero means no detectable error."""
+        length = codewords.shape[1]
+        result = np.zeros((len(codewords), self.nsym), dtype=np.uint8)
+        for i in range(length):
+            result ^= self._syndrome_table[length - 1 - i][codewords[:, i]]
+        return result
+
+    def encode(self, messages: Sequence[bytes]) -> List[bytes]:
+        """Encode each message, splitting long ones into nsize blocks like RSCodec.encode."""
+        encoded = [b''] * len(messages)
+        for length, indices in _group_by_length(messages).items():
+            if length == 0:
+                continue
+            rows = _stack(messages, indices, length)
+            blocks = [self.encode_array(rows[:, start:start + self.block_data])
+                      for start in range(0, length, self.block_data)]
+            for i, row in zip(indices, np.concatenate(blocks, axis=1)):
+                encoded[i] = row.tobytes()
+        return encoded
+
+    def decode(self, codewords: Sequence[bytes]) -> List[bytes]:
+        """
+        Decode and error-correct each codeword, like RSCodec.decode(...)[0].
+
+        Every codeword is attempted before raising, so the counters cover the whole batch.
+
+        Raises:
+            reedsolo.ReedSolomonError: If any codeword has too many errors to correct
+        """
+        decoded = [b''] * len(codewords)
+        failed = 0
+        for length, indices in _group_by_length(codewords).items():
+            if length == 0:
+                continue
+            starts = range(0, length, self.nsize)
+            if length - starts[-1] <= self.nsym:
+                # The last block holds no data; leave it to reedsolo to reject
+                clean = np.zeros(len(indices), dtype=bool)
+            else:
+                rows = _stack(codewords, indices, length)
+                clean = np.ones(len(indices), dtype=bool)
+                for start in starts:
+                    clean &= ~self.syndromes(rows[:, start:start + self.nsize]).any(axis=1)
+                data = np.concatenate(
+                    [rows[:, start:min(start + self.nsize, length) - self.nsym] for start in starts], axis=1
+                )
+            self.clean += int(clean.sum())
+            for row in np.flatnonzero(clean).tolist():
+                decoded[indices[row]] = data[row].tobytes()
+            for row in np.flatnonzero(~clean).tolist():
+                i = indices[row]
+                try:
+                    decoded[i] = bytes(self.codec.decode(codewords[i])[0])
+                    self.corrected += 1
+                except ReedSolomonError:
+                    failed += 1
+        self.failed += failed
+        if failed:
+            raise ReedSolomonError(f"Could not correct {failed} of {len(codewords)} codewords")
+        return decoded
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of codewords decoded clean, corrected and failed so far."""
+        return {"clean": self.clean, "corrected": self.corrected, "failed": self.failed}
+
+    def reset_stats(self) -> None:
+        """Zero the decode counters."""
+        self.clean = self.corrected = self.failed = 0
+
+
+def _group_by_length(items: Sequence[bytes]) -> Dict[int, List[int]]:
+    """Indices of items grouped by their length."""
+    groups: Dict[int, List[int]] = {}
+    for i, item in enumerate(items):
+        groups.setdefault(len(item), []).append(i)
+    return groups
+
+
+def _stack(items: Sequence[bytes], indices: List[int], length: int) -> np.ndarray:
+    """Equal-length items as rows of a uint8 array."""
+    joined = b''.join(bytes(items[i]) for i in indices)
+    return np.frombuffer(joined, dtype=np.uint8).reshape(len(indices), length)
@@ -0,0 +1,97 @@
+from typing import List, NamedTuple
+import struct
+import time
+import zlib
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_ZIP64_OFFSET_EXTRA = struct.Struct('<HHQ')
+_ZIP64_END = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+_END = struct.Struct('<IHHHHIIH')
+
+# Past these offsets/sizes and member counts the classic fields are maxed out and ZIP64 records take over
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_MAX_MEMBERS = 0xFFFF
+_MAX_UINT32 = 0xFFFFFFFF
+_MAX_UINT16 = 0xFFFF
+
+_DEFLATED = 8
+_VERSION = 20
+_ZIP64_VERSION = 45
+
+
+class ZipMember(NamedTuple):
+    """One deflated ZIP member; small enough to build in a worker process and send back."""
+
+    name: bytes
+    crc: int
+    size: int
+    data: bytes
+
+
+def deflate_member(name: str, data: bytes) -> ZipMember:
+    """Compress data into a ZIP member, the CPU-heavy part of writing a ZIP."""
+    if len(data) >= ZIP64_LIMIT:
+        raise ValueError("ZIP member is too large")
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return ZipMember(name.encode(), zlib.crc32(data), len(data), compressor.compress(data) + compressor.flush())
+
+
+class ZipStreamWriter:
+    """
+    Write a ZIP archive front to back from members made by deflate_member.
+
+    Unlike zipfile, it keeps no per-member objects: only the encoded central
+    directory record of each member (tens of bytes) is held until close().
+    ZIP64 records are added when the archive outgrows the classic fields.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self._directory: List[bytes] = []
+        now = time.localtime()
+        self._time = now.tm_hour << 11 | now.tm_min << 5 | now.tm_sec // 2
+        self._date = (now.tm_year - 1980) << 9 | now.tm_mon << 5 | now.tm_mday
+
+    def add(self, member: ZipMember) -> bytes:
+        """Return the bytes of the next member: its local header followed by the compressed data."""
+        header = _LOCAL_HEADER.pack(
+            0x04034b50, _VERSION, 0, _DEFLATED, self._time, self._date,
+            member.crc, len(member.data), member.size, len(member.name), 0
+        ) + member.name
+
+        zip64 = self.offset >= ZIP64_LIMIT
+        extra = _ZIP64_OFFSET_EXTRA.pack(1, 8, self.offset) if zip64 else b''
+        version = _ZIP64_VERSION if zip64 else _VERSION
+        self._directory.append(_CENTRAL_HEADER.pack(
+            0x02014b50, version, version, 0, _DEFLATED, self._time, self._date,
+            member.crc, len(member.data), member.size, len(member.name), len(extra), 0, 0, 0,
+            0o600 << 16, _MAX_UINT32 if zip64 else self.offset
+        ) + member.name + extra)
+
+        self.offset += len(header) + len(member.data)
+        return header + member.data
+
+    def close(self) -> bytes:
+        """Return the central directory and end records that finish the archive."""
+        directory = b''.join(self._directory)
+        count = len(self._directory)
+        start = self.offset
+        records = directory
+        zip64 = count >= ZIP_MAX_MEMBERS or start >= ZIP64_LIMIT or len(directory) >= ZIP64_LIMIT
+        if zip64:
+            zip64_end = start + len(directory)
+            records += _ZIP64_END.pack(
+                0x06064b50, _ZIP64_END.size - 12, _ZIP64_VERSION, _ZIP64_VERSION, 0, 0,
+                count, count, len(directory), start
+            )
+            records += _ZIP64_LOCATOR.pack(0x07064b50, 0, zip64_end, 1)
+        entries = _MAX_UINT16 if zip64 else count
+        records += _END.pack(
+            0x06054b50, 0, 0, entries, entries,
+            _MAX_UINT32 if zip64 else len(directory), _MAX_UINT32 if zip64 else start, 0
+        )
+        self.offset += len(records)
+        self._directory = []
+        return records
@@ -0,0 +1,135 @@
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from fastapi import HTTPException, status
+
+# Configuration
+JOB_WORKERS = int(os.environ.get("DNA_JOB_WORKERS", 2))
+JOB_QUEUE_DEPTH = int(os.environ.get("DNA_JOB_QUEUE_DEPTH", 32))
+JOB_RESULT_TTL = int(os.environ.get("DNA_JOB_RESULT_TTL", 3600))  # seconds
+JOB_DIR = os.environ.get("DNA_JOB_DIR", os.path.join(tempfile.gettempdir(), "dna-jobs"))
+
+class Job:
+    """State and progress of one background encode job."""
+
+    def __init__(self, owner: str, directory: str, **params):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.params = params
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.chunks_total = 0
+        self.chunks_done = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.input_path = os.path.join(directory, f"{self.id}.input")
+        self.result_path = os.path.join(directory, f"{self.id}.result")
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Input throughput since the job started running."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    def remove_files(self) -> None:
+        for path in (self.input_path, self.result_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+JobRunner = Callable[[Job], Awaitable[None]]
+
+class JobQueue:
+    """
+    In-process queue of background jobs with inputs and results stored on local disk.
+
+    A fixed number of runner tasks work through the queue; once `queue_depth`
+    jobs are waiting, submissions are rejected with 503. Finished jobs and
+    their files are purged `result_ttl` seconds after they complete.
+    """
+
+    def __init__(self, directory: str = JOB_DIR, workers: int = JOB_WORKERS,
+                 queue_depth: int = JOB_QUEUE_DEPTH, result_ttl: float = JOB_RESULT_TTL):
+        self.directory = directory
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    def create(self, owner: str, **params) -> Job:
+        """Register a new job whose input the caller writes to job.input_path before submitting."""
+        self.purge_expired()
+        if self._queue is not None and self._queue.qsize() >= self.queue_depth:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Job queue is full, please retry",
+                headers={"Retry-After": "30"},
+            )
+        os.makedirs(self.directory, exist_ok=True)
+        job = Job(owner, self.directory, **params)
+        self._jobs[job.id] = job
+        return job
+
+    def submit(self, job: Job, runner: JobRunner) -> None:
+        """Queue job to be processed by runner(job)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._queue.put_nowait((job, runner))
+
+    def get(self, job_id: str, owner: str) -> Job:
+        """Return the job, raising 404 if it does not exist or belongs to another user."""
+        job = self._jobs.get(job_id)
+        if job is None or job.owner != owner:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    def discard(self, job: Job) -> None:
+        """Forget a job and delete its files."""
+        self._jobs.pop(job.id, None)
+        job.remove_files()
+
+    def purge_expired(self) -> None:
+        """Discard finished jobs older than the result TTL."""
+        cutoff = time.time() - self.result_ttl
+        for job in list(self._jobs.values()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                self.discard(job)
+
+    async def shutdown(self) -> None:
+        """Stop the runner tasks; queued jobs are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _work(self) -> None:
+        while True:
+            job, runner = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                await runner(job)
+                job.status = "completed"
+            except Exception as e:
+                job.status = "failed"
+                job.error = e.detail if isinstance(e, HTTPException) else str(e)
+                if os.path.exists(job.result_path):
+                    os.remove(job.result_path)
+            finally:
+                job.finished_at = time.time()
+                if os.path.exists(job.input_path):
+                    os.remove(job.input_path)
+                self._queue.task_done()
+
+job_queue = JobQueue()
@@ -1,20 +1,79 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Body, Depends, status
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Body, Depends, Header, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import Dict, Optional, List, Any
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional, List, Any, Tuple, Union
+from contextlib import asynccontextmanager
+import asyncio
+import base64
+import codecs
+import copy
+import csv
 import io
+import os
+import tempfile
+import time
 from pydantic import BaseModel, ConfigDict
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes, hmac, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 import hashlib
 import zipfile
+import zlib
 import struct
 from datetime import timedelta
 import mimetypes
+import numpy as np
+from itertools import islice
+from urllib.parse import quote
+from .core.codec import binary_to_dna, dna_to_binary
+from .core.packed import PackedStrands
+from .core.zipstream import ZipMember, ZipStreamWriter, deflate_member
 from .auth import (
     Token, User, create_access_token, get_current_user,
     ACCESS_TOKEN_EXPIRE_MINUTES, verify_password, get_user
 )
+from .jobs import Job, job_queue
+from .uploads import Upload, upload_store
+from .workers import cpu_pool
+
+# Size of the blocks uploads are read and encoded in
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Largest upload /encode returns as a JSON body, which holds every sequence in memory at once
+MAX_JSON_ENCODE_SIZE = int(os.environ.get("DNA_MAX_JSON_ENCODE_SIZE", 32 * 1024 ** 2))
+
+# Each strand starts with a 4-byte index and a 4-byte CRC32 checksum
+HEADER_SIZE = 8
+# Top bit of the index marks the final strand, so truncated uploads can be detected
+LAST_STRAND_FLAG = 0x80000000
+
+# Number of strands /decode verifies per batch
+VERIFY_BATCH_SIZE = 4096
+
+def _build_crc32_table() -> np.ndarray:
+    """Byte-wise lookup table for the reflected CRC-32 polynomial zlib uses."""
+    table = np.arange(256, dtype=np.uint32)
+    for _ in range(8):
+        table = np.where(table & 1, (table >> 1) ^ np.uint32(0xEDB88320), table >> 1).astype(np.uint32)
+    return table
+
+_CRC32_TABLE = _build_crc32_table()
+
+# Resumable uploads follow the tus core protocol
+TUS_VERSION = "1.0.0"
+
+# Streamed /encode output formats and their media types
+STREAM_MEDIA_TYPES = {
+    "zip": "application/zip",
+    "fasta": "text/x-fasta",
+    "csv": "text/csv",
+    "packed": "application/octet-stream",
+}
+GENSCRIPT_CSV_HEADER = (
+    'Name(<100 characters),"*sequence required(200bp ≤ DNA sequence ≤ 1,800bp '
+    'or 66bp ≤ Amino Acid sequence < = 1,000aa)"\r\n'
+)
 
 # Define response models
 class EncodeRequest(BaseModel):
@@ -34,6 +93,28 @@ class DecodeRequest(BaseModel):
     file_type: Optional[str] = None  # New field for file type
     template_format: str = "genscript"  # New field for template format
 
+def encode_request_form(
+    password: Optional[str] = Form(None),
+    base_length: int = Form(100),
+    error_correction: int = Form(1),
+    template_format: str = Form("genscript")
+) -> EncodeRequest:
+    """Read EncodeRequest from the multipart form fields sent alongside the file."""
+    return EncodeRequest(
+        password=password or None,
+        base_length=base_length,
+        error_correction=error_correction,
+        template_format=template_format
+    )
+
+def decode_request_form(
+    password: Optional[str] = Form(None),
+    file_type: Optional[str] = Form(None),
+    template_format: str = Form("genscript")
+) -> DecodeRequest:
+    """Read DecodeRequest from the multipart form fields sent alongside the file."""
+    return DecodeRequest(password=password or None, file_type=file_type or None, template_format=template_format)
+
 class DecodeResponse(BaseModel):
     decoded_data: str
     decoded_size: int
@@ -42,6 +123,22 @@ class DecodeResponse(BaseModel):
 class HealthResponse(BaseModel):
     status: str
 
+class UploadResponse(BaseModel):
+    upload_id: str
+    offset: int
+    length: int
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    output_format: str
+    bytes_total: int
+    bytes_done: int
+    chunks_total: int
+    chunks_done: int
+    bytes_per_second: float
+    error: Optional[str] = None
+
 def get_encryption_key(password: str) -> bytes:
     """Generate a Fernet key from the password."""
     key = hashlib.sha256(password.encode()).digest()
@@ -59,43 +156,412 @@ def decrypt_data(encrypted_data: bytes, password: str) -> bytes:
     f = Fernet(key)
     return f.decrypt(encrypted_data)
 
+class StreamingFernetEncryptor:
+    """
+    Build a Fernet token incrementally, so large uploads never have to be held in full.
+
+    The concatenated output of update() and finalize() is a regular Fernet
+    token that decrypt_data() accepts. The CBC chaining block is kept
+    explicitly, so the state can be copied.
+    """
+
+    def __init__(self, password: str):
+        key = base64.urlsafe_b64decode(get_encryption_key(password))
+        iv = os.urandom(16)
+        self._key = key[16:]
+        self._chain = iv  # the previous ciphertext block, which CBC mixes into the next
+        self._buffer = b''  # plaintext short of a whole AES block
+        self._signer = hmac.HMAC(key[:16], hashes.SHA256())
+        # Version byte, timestamp and IV, as laid out by Fernet
+        self._pending = b"\x80" + struct.pack(">Q", int(time.time())) + iv
+        self._signer.update(self._pending)
+
+    def update(self, data: bytes) -> bytes:
+        """Encrypt the next block of plaintext, returning the token bytes ready so far."""
+        data = self._buffer + data
+        ready = len(data) - len(data) % 16
+        self._buffer = data[ready:]
+        return self._encode(self._encrypt(data[:ready]))
+
+    def finalize(self) -> bytes:
+        """Return the rest of the token, including the HMAC."""
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        ciphertext = self._encrypt(padder.update(self._buffer) + padder.finalize())
+        self._buffer = b''
+        token = base64.urlsafe_b64encode(self._pending + ciphertext + self._signer.finalize())
+        self._pending = b''
+        return token
+
+    def copy(self) -> "StreamingFernetEncryptor":
+        """Return an independent copy of the encryption state."""
+        other = copy.copy(self)
+        other._signer = self._signer.copy()
+        return other
+
+    @staticmethod
+    def token_size(size: int) -> int:
+        """Length of the token produced for size bytes of plaintext."""
+        # Version, timestamp, IV, PKCS7-padded ciphertext and HMAC, then base64
+        raw = 1 + 8 + 16 + (size // 16 + 1) * 16 + 32
+        return -(-raw // 3) * 4
+
+    def _encrypt(self, plaintext: bytes) -> bytes:
+        # CBC-encrypt whole blocks, continuing the chain from the previous call
+        if not plaintext:
+            return b''
+        ciphertext = Cipher(algorithms.AES(self._key), modes.CBC(self._chain)).encryptor().update(plaintext)
+        self._chain = ciphertext[-16:]
+        self._signer.update(ciphertext)
+        return ciphertext
+
+    def _encode(self, raw: bytes) -> bytes:
+        # Base64 works on 3-byte groups, so hold back any remainder for the next call
+        raw = self._pending + raw
+        ready = len(raw) - len(raw) % 3
+        self._pending = raw[ready:]
+        return base64.urlsafe_b64encode(raw[:ready])
+
+def bytes_per_sequence(base_length: int) -> int:
+    """Payload bytes per strand so that header + payload fill base_length bases (4 per byte)."""
+    size = base_length // 4 - HEADER_SIZE
+    if size < 1:
+        raise HTTPException(
+            status_code=400,
+            detail=f"base_length must be at least {4 * (HEADER_SIZE + 1)} bases"
+        )
+    return size
+
+def iter_sequences(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Extract DNA sequences from the lines of raw text, FASTA records or GenScript CSV rows.
+
+    Works on bytes line by line, so files and ZIP members can be parsed
+    without reading them fully or decoding them to str.
+    """
+    record = []
+    is_fasta = None
+    for line in lines:
+        line = line.strip()
+        if is_fasta is None:
+            # Spreadsheet exports (like the GenScript template) start with a UTF-8 BOM
+            line = line.removeprefix(codecs.BOM_UTF8).strip()
+        if not line:
+            continue
+        if is_fasta is None:
+            is_fasta = line.startswith(b'>')
+        if line.startswith(b'Name('):
+            continue
+        if line.startswith(b'>'):
+            if record:
+                yield b''.join(record)
+            record = []
+        elif b',' in line:
+            # Parse as CSV so quoted fields may contain commas; latin-1 maps bytes 1:1
+            row = next(csv.reader([line.decode('latin-1')]))
+            yield row[-1].strip().encode('latin-1')
+        elif is_fasta:
+            record.append(line)
+        else:
+            yield line
+    if record:
+        yield b''.join(record)
+
 def split_into_chunks(data: bytes, chunk_size: int) -> List[bytes]:
     """Split data into chunks of specified size."""
     return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
 
-def add_error_correction(chunk: bytes, index: int) -> bytes:
-    """Add error correction and index to chunk."""
-    # Add index (4 bytes) and error correction (2 bytes)
-    index_bytes = struct.pack('>I', index)
-    error_correction = struct.pack('>H', hash(chunk) & 0xFFFF)
+def add_error_correction(chunk: bytes, index: int, last: bool = False) -> bytes:
+    """Add error correction and index (flagged if this is the final strand) to chunk."""
+    # Add index (4 bytes) and a CRC32 of index + data (4 bytes), identical in every process
+    index_bytes = struct.pack('>I', index | LAST_STRAND_FLAG if last else index)
+    error_correction = struct.pack('>I', zlib.crc32(chunk, zlib.crc32(index_bytes)))
     return index_bytes + error_correction + chunk
 
 def verify_error_correction(chunk: bytes) -> bool:
     """Verify error correction of chunk."""
-    if len(chunk) < 6:  # Need at least 6 bytes for index and error correction
+    if len(chunk) < HEADER_SIZE:  # Need the index and error correction
         return False
     index_bytes = chunk[:4]
-    error_correction = chunk[4:6]
-    data = chunk[6:]
-    expected_error_correction = struct.pack('>H', hash(data) & 0xFFFF)
+    error_correction = chunk[4:HEADER_SIZE]
+    data = chunk[HEADER_SIZE:]
+    expected_error_correction = struct.pack('>I', zlib.crc32(data, zlib.crc32(index_bytes)))
     return error_correction == expected_error_correction
 
+def crc32_batch(rows: np.ndarray) -> np.ndarray:
+    """zlib.crc32 of every row of an (n, m) uint8 array, computed for all rows at once."""
+    crc = np.full(len(rows), 0xFFFFFFFF, dtype=np.uint32)
+    for column in rows.T:
+        crc = _CRC32_TABLE[(crc ^ column) & 0xFF] ^ (crc >> 8)
+    return crc ^ np.uint32(0xFFFFFFFF)
+
+def verify_error_correction_batch(chunks: List[bytes]) -> List[bool]:
+    """
+    Verify many chunks at once, returning one result per chunk.
+
+    Chunks of equal length are stacked and their CRC32s computed together
+    with crc32_batch, so the Python loop runs over byte positions, not chunks.
+    """
+    results = [False] * len(chunks)
+    by_length: Dict[int, List[int]] = {}
+    for i, chunk in enumerate(chunks):
+        if len(chunk) >= HEADER_SIZE:  # Need the index and error correction
+            by_length.setdefault(len(chunk), []).append(i)
+    for length, indices in by_length.items():
+        rows = np.frombuffer(b''.join(chunks[i] for i in indices), dtype=np.uint8).reshape(len(indices), length)
+        # The checksum covers the index and the data, skipping the checksum field itself
+        covered = np.concatenate([rows[:, :4], rows[:, HEADER_SIZE:]], axis=1)
+        stored = rows[:, 4:HEADER_SIZE].copy().view('>u4').ravel()
+        for i, valid in zip(indices, (crc32_batch(covered) == stored).tolist()):
+            results[i] = valid
+    return results
+
 def bytes_to_dna(data: bytes) -> str:
-    """Convert bytes to DNA sequence."""
-    dna = ""
-    for byte in data:
-        # Convert each byte to a 4-base DNA sequence
-        dna += "ACGT"[byte % 4]
-    return dna
-
-def dna_to_bytes(dna: str) -> bytes:
+    """Convert bytes to DNA sequence, 4 bases per byte (same 2-bit code as DNAEncoder)."""
+    return binary_to_dna(data)
+
+def dna_to_bytes(dna: Union[str, bytes]) -> bytes:
     """Convert DNA sequence back to bytes."""
-    data = bytearray()
-    for i in range(0, len(dna), 4):
-        if i + 4 <= len(dna):
-            byte = "ACGT".index(dna[i])
-            data.append(byte)
-    return bytes(data)
+    return dna_to_binary(dna)
+
+class SequenceEncoder:
+    """Incremental /encode pipeline: optional encryption, chunking, error correction and DNA conversion."""
+
+    def __init__(self, chunk_size: int, password: Optional[str] = None):
+        self.chunk_size = chunk_size
+        self.encryptor = StreamingFernetEncryptor(password) if password else None
+        self.size = 0
+        self.sequence_count = 0
+        self._pending = b''
+
+    def push(self, data: bytes) -> List[str]:
+        """Feed the next block of the upload, returning the sequences completed by it."""
+        return encode_chunks(*self.take(data))
+
+    def finish(self) -> List[str]:
+        """Flush the remaining data, returning the last sequences."""
+        return encode_chunks(*self.take_rest())
+
+    def copy(self) -> "SequenceEncoder":
+        """Return an independent copy, so a block can be fed and the new state kept only if encoding succeeds."""
+        other = copy.copy(self)
+        if self.encryptor:
+            other.encryptor = self.encryptor.copy()
+        return other
+
+    def take(self, data: bytes) -> Tuple[bytes, int, int, bool]:
+        """
+        Feed the next block, returning the encode_chunks arguments for the chunks it completes.
+
+        Splitting this from push() lets callers run encode_chunks in another process.
+        """
+        if self.encryptor:
+            data = self.encryptor.update(data)
+        return self._take(data, final=False)
+
+    def take_rest(self) -> Tuple[bytes, int, int, bool]:
+        """Flush the remaining data, returning the encode_chunks arguments for it."""
+        data = self.encryptor.finalize() if self.encryptor else b''
+        return self._take(data, final=True)
+
+    def _take(self, data: bytes, final: bool) -> Tuple[bytes, int, int, bool]:
+        self.size += len(data)
+        pending = self._pending + data
+        if final:
+            ready = len(pending)
+        else:
+            # Always hold back the last chunk, so the final flush has a strand to flag as last
+            ready = max(0, len(pending) - 1) // self.chunk_size * self.chunk_size
+        first_index = self.sequence_count
+        self.sequence_count += -(-ready // self.chunk_size)
+        self._pending = pending[ready:]
+        return pending[:ready], first_index, self.chunk_size, final
+
+def encode_chunks(data: bytes, first_index: int, chunk_size: int, final: bool = False) -> List[str]:
+    """
+    Split data into chunks and convert each, with its index and checksum, to a DNA sequence.
+
+    With final set, the last chunk is flagged as the final strand of the file.
+    """
+    chunks = split_into_chunks(data, chunk_size)
+    return [
+        bytes_to_dna(add_error_correction(chunk, first_index + i, last=final and i == len(chunks) - 1))
+        for i, chunk in enumerate(chunks)
+    ]
+
+def iter_upload_chunks(path: str, filename: str) -> Iterator[bytes]:
+    """
+    Yield the raw chunk (header + payload) of every sequence in a spooled upload.
+
+    Packed uploads already hold the chunks as bytes; text and ZIP uploads are
+    read one line at a time and converted with the codec.
+    """
+    if filename.endswith('.packed'):
+        with open(path, 'rb') as packed_file:
+            while True:
+                strands = PackedStrands.read(packed_file)
+                if strands is None:
+                    break
+                for i in range(len(strands)):
+                    yield bytes(strands.packed(i))
+    else:
+        for sequence in iter_upload_sequences(path, filename):
+            yield dna_to_bytes(sequence)
+
+def iter_upload_sequences(path: str, filename: str) -> Iterator[bytes]:
+    """Yield the sequences of a spooled upload, reading ZIP members one line at a time."""
+    if filename.endswith('.zip'):
+        with zipfile.ZipFile(path) as zip_file:
+            for zip_info in zip_file.infolist():
+                if zip_info.filename.endswith('.txt'):
+                    with zip_file.open(zip_info) as member:
+                        yield from iter_sequences(member)
+    else:
+        with open(path, 'rb') as text_file:
+            yield from iter_sequences(text_file)
+
+def decode_upload(path: str, filename: str, password: Optional[str]) -> bytes:
+    """
+    Decode a spooled ZIP, text or packed file of sequences back to the original data.
+
+    Raises ValueError when sequences fail verification, are missing or cannot be decrypted.
+    """
+    # Convert DNA sequences back to bytes as they are read, keeping only the payloads
+    chunks = {}
+    last_index = None
+    failed = 0
+    strands = iter_upload_chunks(path, filename)
+    while True:
+        batch = list(islice(strands, VERIFY_BATCH_SIZE))
+        if not batch:
+            break
+        for chunk, valid in zip(batch, verify_error_correction_batch(batch)):
+            if not valid:
+                failed += 1
+                continue
+            index = struct.unpack('>I', chunk[:4])[0]
+            if index & LAST_STRAND_FLAG:
+                index &= ~LAST_STRAND_FLAG
+                last_index = index
+            chunks[index] = chunk[HEADER_SIZE:]  # Remove index and error correction
+    if failed:
+        raise ValueError(f"Error correction failed for {failed} sequences")
+
+    # Combine chunks in index order, whatever order the sequences arrived in; every
+    # strand up to the one flagged as last must be there, or the file is truncated
+    if chunks and (last_index is None or last_index != len(chunks) - 1 or sorted(chunks) != list(range(len(chunks)))):
+        raise ValueError("Missing sequences")
+    content = b''.join(chunks[index] for index in range(len(chunks)))
+
+    # Decrypt content if password is provided
+    if password:
+        try:
+            content = decrypt_data(content, password)
+        except InvalidToken:
+            raise ValueError("Invalid password or corrupted data")
+    return content
+
+def serialize_sequences(sequences: List[str], first_index: int, output_format: str) -> Union[bytes, ZipMember]:
+    """
+    Serialize a block of sequences numbered from first_index in a streamed output format.
+
+    ZIP output gets one deflated member per block, holding its sequences one per line.
+    """
+    if output_format == "zip":
+        return deflate_member(f'sequences_{first_index}.txt', ''.join(f'{sequence}\n' for sequence in sequences).encode())
+    if output_format == "packed":
+        return PackedStrands.from_strings(sequences).tobytes()
+    template = '>sequence_{}\n{}\n' if output_format == "fasta" else 'sequence_{},{}\r\n'
+    return ''.join(template.format(index, sequence)
+                   for index, sequence in enumerate(sequences, first_index)).encode()
+
+def encode_block(data: bytes, first_index: int, chunk_size: int, final: bool,
+                 output_format: str) -> Union[bytes, ZipMember, None]:
+    """
+    encode_chunks followed by serialize_sequences, so both run in one CPU pool call.
+
+    Returns None when data completes no sequences.
+    """
+    sequences = encode_chunks(data, first_index, chunk_size, final)
+    return serialize_sequences(sequences, first_index, output_format) if sequences else None
+
+class SequenceFileWriter:
+    """
+    Assemble the blocks serialized by encode_block into a ZIP of .txt files, FASTA, GenScript CSV or PackedStrands blocks.
+
+    Each block is one ZIP member, so a ZIP keeps one small central directory
+    record per block rather than per sequence until close().
+    """
+
+    def __init__(self, output_format: str):
+        self.output_format = output_format
+        self._zip = ZipStreamWriter() if output_format == "zip" else None
+        self._header = GENSCRIPT_CSV_HEADER.encode() if output_format == "csv" else b''
+
+    def add(self, part: Union[bytes, ZipMember, None]) -> bytes:
+        """Add the next serialized block, returning the bytes ready to send."""
+        data, self._header = self._header, b''
+        if part is not None:
+            data += self._zip.add(part) if self._zip else part
+        return data
+
+    def close(self) -> bytes:
+        """Finish the output (the ZIP central directory), returning the last bytes."""
+        data, self._header = self._header, b''
+        return data + self._zip.close() if self._zip else data
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for a request that holds a CPU pool slot from cpu_pool.reserve().
+
+    The slot is released however sending ends: completed, failed, or the client
+    disconnected, even before the body iterator started.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            cpu_pool.release()
+
+def content_disposition(filename: str) -> str:
+    """Attachment header for filename, percent-encoded as filename* when needed, like FileResponse."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+async def encode_part(encoder: SequenceEncoder, output_format: str,
+                      block: Optional[bytes] = None) -> Union[bytes, ZipMember, None]:
+    """
+    Encode the next upload block (or, without one, flush the rest) into a serialized part for SequenceFileWriter.
+
+    Encryption runs in a thread, and chunking, conversion and serialization (including
+    ZIP compression) in the CPU pool, so the event loop only joins the results.
+    Callers hold a pool slot or are bounded elsewhere.
+    """
+    if block is None:
+        args = await asyncio.to_thread(encoder.take_rest)
+    else:
+        args = await asyncio.to_thread(encoder.take, block)
+    return await cpu_pool.run(encode_block, *args, output_format, wait=True)
+
+async def encode_next(encoder: SequenceEncoder, writer: SequenceFileWriter, block: Optional[bytes] = None) -> bytes:
+    """encode_part, added to writer: the output bytes ready to send."""
+    return writer.add(await encode_part(encoder, writer.output_format, block))
+
+async def iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an upload in fixed-size blocks instead of all at once."""
+    while True:
+        block = await file.read(chunk_size)
+        if not block:
+            break
+        yield block
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await job_queue.shutdown()
+    cpu_pool.shutdown()
 
 app = FastAPI(
     title="DNA Encoder/Decoder API",
@@ -106,6 +572,8 @@ app = FastAPI(
     * File to DNA sequence encoding with optional password encryption
     * DNA sequence to file decoding with password decryption
     * Configurable base length and error correction
+    * Background encode jobs (`/jobs/encode`) with progress polling for large files
+    * Resumable uploads (`/uploads`, tus-style) that are encoded while they arrive
     * Health check endpoint
     
     ## Usage
@@ -117,7 +585,8 @@ app = FastAPI(
     """,
     version="1.0.2",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -162,57 +631,306 @@ async def health_check():
 )
 async def encode_file(
     file: UploadFile = File(..., description="The file to encode into DNA sequence"),
-    request: EncodeRequest = None,
+    request: EncodeRequest = Depends(encode_request_form),
+    output_format: str = Query(
+        "json",
+        description=f"\"json\" for a JSON body (files up to {MAX_JSON_ENCODE_SIZE} bytes), or \"zip\", \"fasta\", \"csv\" or \"packed\" (2 bits per base) to stream the sequences as a file"
+    ),
     current_user: User = Depends(get_current_user)
 ) -> EncodeResponse:
+    chunk_size = bytes_per_sequence(request.base_length)
+    if output_format in STREAM_MEDIA_TYPES:
+        response = AdmittedStreamingResponse(
+            stream_encoded_file(file, request.password, chunk_size, output_format),
+            media_type=STREAM_MEDIA_TYPES[output_format],
+            headers={"Content-Disposition": content_disposition(f"{file.filename}.{output_format}")}
+        )
+        # Admit the request before the 200 headers go out, once nothing else can fail here;
+        # the response releases the slot when it ends
+        cpu_pool.reserve()
+        return response
+    if output_format != "json":
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+    json_too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Files over {MAX_JSON_ENCODE_SIZE} bytes cannot be returned as JSON; "
+               "use output_format=zip, fasta, csv or packed to stream the sequences"
+    )
+    if file.size is not None and file.size > MAX_JSON_ENCODE_SIZE:
+        raise json_too_large
+
     try:
-        content = await file.read()
-        
-        # Encrypt content if password is provided
-        is_encrypted = False
-        if request.password:
-            content = encrypt_data(content, request.password)
-            is_encrypted = True
-        
-        # Split content into chunks
-        chunks = split_into_chunks(content, request.base_length - 6)  # Reserve 6 bytes for index and error correction
-        
-        # Convert chunks to DNA sequences
+        # Encrypt (if password is provided), chunk and convert the upload block by block,
+        # with the conversion itself running in the CPU pool
+        is_encrypted = bool(request.password)
+        encoder = SequenceEncoder(chunk_size, request.password)
         sequences = []
-        for i, chunk in enumerate(chunks):
-            chunk_with_ec = add_error_correction(chunk, i)
-            dna_sequence = bytes_to_dna(chunk_with_ec)
-            sequences.append(dna_sequence)
+        received = 0
+        with cpu_pool.admit():
+            async for block in iter_upload(file):
+                received += len(block)
+                if received > MAX_JSON_ENCODE_SIZE:
+                    raise json_too_large
+                args = await asyncio.to_thread(encoder.take, block)
+                sequences.extend(await cpu_pool.run(encode_chunks, *args, wait=True))
+            args = await asyncio.to_thread(encoder.take_rest)
+            sequences.extend(await cpu_pool.run(encode_chunks, *args, wait=True))
         
         # Create metadata
         metadata = {
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(content),
+            "size": encoder.size,
             "sequence_count": len(sequences),
             "base_length": request.base_length,
             "error_correction": request.error_correction,
             "is_encrypted": is_encrypted
         }
         
-        # Create ZIP file containing sequences
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for i, sequence in enumerate(sequences):
-                zip_file.writestr(f'sequence_{i}.txt', sequence)
-        
-        # Convert ZIP to base64
-        zip_base64 = base64.b64encode(zip_buffer.getvalue()).decode('utf-8')
-        
         return EncodeResponse(
             sequences=sequences,
             metadata=metadata,
-            template_format=request.template_format,
-            zip_file=zip_base64
+            template_format=request.template_format
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def stream_encoded_file(file: UploadFile, password: Optional[str], chunk_size: int,
+                              output_format: str) -> AsyncIterator[bytes]:
+    """
+    Encode an upload block by block, yielding the serialized sequences as they are produced.
+
+    Runs inside an AdmittedStreamingResponse, whose CPU pool slot covers the pool calls.
+    """
+    encoder = SequenceEncoder(chunk_size, password)
+    writer = SequenceFileWriter(output_format)
+    async for block in iter_upload(file):
+        data = await encode_next(encoder, writer, block)
+        if data:
+            yield data
+    yield await encode_next(encoder, writer) + writer.close()
+
+async def run_encode_job(job: Job) -> None:
+    """Encode a job's spooled input into its result file, updating its progress as it goes."""
+    encoder = SequenceEncoder(job.params["chunk_size"], job.params.pop("password"))
+    writer = SequenceFileWriter(job.params["output_format"])
+    with open(job.input_path, 'rb') as source, open(job.result_path, 'wb') as result:
+        while True:
+            block = source.read(UPLOAD_CHUNK_SIZE)
+            if not block:
+                break
+            result.write(await encode_next(encoder, writer, block))
+            job.bytes_done += len(block)
+            job.chunks_done = encoder.sequence_count
+        result.write(await encode_next(encoder, writer))
+        result.write(writer.close())
+        job.chunks_done = encoder.sequence_count
+
+def job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        status=job.status,
+        output_format=job.params["output_format"],
+        bytes_total=job.bytes_total,
+        bytes_done=job.bytes_done,
+        chunks_total=job.chunks_total,
+        chunks_done=job.chunks_done,
+        bytes_per_second=job.bytes_per_second,
+        error=job.error
+    )
+
+@app.post(
+    "/jobs/encode",
+    response_model=JobResponse,
+    status_code=202,
+    summary="Start Background Encode",
+    description="Upload a file to encode in the background; poll /jobs/{job_id} and download /jobs/{job_id}/result."
+)
+async def create_encode_job(
+    file: UploadFile = File(..., description="The file to encode into DNA sequence"),
+    request: EncodeRequest = Depends(encode_request_form),
+    output_format: str = Query("zip", description="\"zip\", \"fasta\", \"csv\" or \"packed\""),
+    current_user: User = Depends(get_current_user)
+) -> JobResponse:
+    if output_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+    chunk_size = bytes_per_sequence(request.base_length)
+    job = job_queue.create(
+        current_user.username,
+        filename=file.filename,
+        output_format=output_format,
+        chunk_size=chunk_size,
+        password=request.password
+    )
+
+    # Spool the upload to disk so the request can return before encoding starts
+    try:
+        with open(job.input_path, 'wb') as spool:
+            async for block in iter_upload(file):
+                spool.write(block)
+                job.bytes_total += len(block)
+    except Exception:
+        job_queue.discard(job)
+        raise
+    encoded_size = StreamingFernetEncryptor.token_size(job.bytes_total) if request.password else job.bytes_total
+    job.chunks_total = -(-encoded_size // chunk_size)
+
+    job_queue.submit(job, run_encode_job)
+    return job_response(job)
+
+@app.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Background Job Status",
+    description="Report the status and progress of a background encode job."
+)
+async def get_job(job_id: str, current_user: User = Depends(get_current_user)) -> JobResponse:
+    return job_response(job_queue.get(job_id, current_user.username))
+
+@app.get(
+    "/jobs/{job_id}/result",
+    summary="Background Job Result",
+    description="Download the encoded sequences of a completed background job."
+)
+async def get_job_result(job_id: str, current_user: User = Depends(get_current_user)):
+    job = job_queue.get(job_id, current_user.username)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    output_format = job.params["output_format"]
+    return FileResponse(
+        job.result_path,
+        media_type=STREAM_MEDIA_TYPES[output_format],
+        filename=f'{job.params["filename"]}.{output_format}'
+    )
+
+async def append_to_upload(upload: Upload, data: bytes) -> None:
+    """
+    Encode the next bytes of an upload into its result file.
+
+    A copy of the encoder is fed and kept only once the output is written, so
+    a failed block leaves the upload at its old offset, ready to be resent.
+    """
+    encoder = upload.encoder.copy()
+    part = await encode_part(encoder, upload.writer.output_format, data)
+    with open(upload.result_path, 'ab') as result:
+        result.write(upload.writer.add(part))
+    upload.encoder = encoder
+    upload.offset += len(data)
+
+def upload_headers(upload: Upload) -> Dict[str, str]:
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.length),
+        "Cache-Control": "no-store",
+    }
+
+@app.post(
+    "/uploads",
+    response_model=UploadResponse,
+    status_code=201,
+    summary="Create Resumable Upload",
+    description="Start a resumable upload of Upload-Length bytes; send the bytes with PATCH and finish with /finalize."
+)
+async def create_upload(
+    response: Response,
+    upload_length: int = Header(..., alias="Upload-Length"),
+    filename: str = Form("upload"),
+    request: EncodeRequest = Depends(encode_request_form),
+    output_format: str = Query("zip", description="\"zip\", \"fasta\", \"csv\" or \"packed\""),
+    current_user: User = Depends(get_current_user)
+) -> UploadResponse:
+    if output_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+    chunk_size = bytes_per_sequence(request.base_length)
+    upload = upload_store.create(
+        current_user.username,
+        upload_length,
+        filename=filename,
+        output_format=output_format
+    )
+    upload.encoder = SequenceEncoder(chunk_size, request.password)
+    upload.writer = SequenceFileWriter(output_format)
+
+    response.headers.update(upload_headers(upload))
+    response.headers["Location"] = f"/uploads/{upload.id}"
+    return UploadResponse(upload_id=upload.id, offset=upload.offset, length=upload.length)
+
+@app.head(
+    "/uploads/{upload_id}",
+    summary="Resumable Upload Offset",
+    description="Report how many bytes of the upload have been received, in the Upload-Offset header."
+)
+async def get_upload_offset(upload_id: str, current_user: User = Depends(get_current_user)):
+    upload = upload_store.get(upload_id, current_user.username)
+    return Response(status_code=200, headers=upload_headers(upload))
+
+@app.patch(
+    "/uploads/{upload_id}",
+    status_code=204,
+    summary="Append To Resumable Upload",
+    description="Send the next bytes of the upload, starting at the current Upload-Offset."
+)
+async def patch_upload(
+    upload_id: str,
+    http_request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    current_user: User = Depends(get_current_user)
+):
+    upload = upload_store.get(upload_id, current_user.username)
+    if upload.finished:
+        raise HTTPException(status_code=409, detail="Upload is already finalized")
+    if upload.lock.locked():
+        raise HTTPException(status_code=409, detail="Upload is busy")
+    async with upload.lock:
+        if upload_offset != upload.offset:
+            raise HTTPException(status_code=409, detail=f"Upload-Offset must be {upload.offset}")
+
+        # Keep whatever arrives before a dropped connection, so the client can resume after it
+        buffer = bytearray()
+        with cpu_pool.admit():
+            try:
+                async for data in http_request.stream():
+                    if upload.offset + len(buffer) + len(data) > upload.length:
+                        raise HTTPException(status_code=400, detail="Data exceeds Upload-Length")
+                    buffer += data
+                    if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                        await append_to_upload(upload, bytes(buffer))
+                        buffer.clear()
+            finally:
+                if buffer:
+                    await append_to_upload(upload, bytes(buffer))
+    return Response(status_code=204, headers=upload_headers(upload))
+
+@app.post(
+    "/uploads/{upload_id}/finalize",
+    summary="Finalize Resumable Upload",
+    description="Finish encoding a fully received upload and download its sequences."
+)
+async def finalize_upload(upload_id: str, current_user: User = Depends(get_current_user)):
+    upload = upload_store.get(upload_id, current_user.username)
+    async with upload.lock:
+        if upload.offset != upload.length:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload is incomplete: {upload.offset} of {upload.length} bytes received"
+            )
+        if not upload.finished:
+            with cpu_pool.admit():
+                output = await encode_next(upload.encoder, upload.writer)
+            with open(upload.result_path, 'ab') as result:
+                result.write(output)
+                result.write(upload.writer.close())
+            upload.finished = True
+    output_format = upload.params["output_format"]
+    return FileResponse(
+        upload.result_path,
+        media_type=STREAM_MEDIA_TYPES[output_format],
+        filename=f'{upload.params["filename"]}.{output_format}'
+    )
+
 @app.post(
     "/decode",
     response_model=DecodeResponse,
@@ -221,42 +939,21 @@ async def encode_file(
 )
 async def decode_file(
     file: UploadFile = File(..., description="The DNA sequences to decode and optional password"),
-    request: DecodeRequest = None,
+    request: DecodeRequest = Depends(decode_request_form),
     current_user: User = Depends(get_current_user)
 ) -> DecodeResponse:
     try:
-        content = await file.read()
-        
-        # Handle ZIP files
-        if file.filename.endswith('.zip'):
-            with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
-                # Process multiple sequences from ZIP
-                sequences = []
-                for zip_info in zip_file.filelist:
-                    if zip_info.filename.endswith('.txt'):
-                        sequences.append(zip_file.read(zip_info.filename).decode())
-        else:
-            sequences = [content.decode()]
-
-        # Convert DNA sequences back to bytes
-        chunks = []
-        for sequence in sequences:
-            chunk = dna_to_bytes(sequence)
-            if not verify_error_correction(chunk):
-                raise HTTPException(status_code=400, detail="Error correction failed")
-            chunks.append(chunk[6:])  # Remove index and error correction
-        
-        # Combine chunks
-        content = b''.join(chunks)
-        
-        # Decrypt content if password is provided
-        is_encrypted = False
-        if request.password:
-            try:
-                content = decrypt_data(content, request.password)
-                is_encrypted = True
-            except Exception as e:
-                raise HTTPException(status_code=400, detail="Invalid password or corrupted data")
+        # Spool the upload to disk, then parse, verify, reassemble and decrypt in the CPU pool
+        with tempfile.NamedTemporaryFile(delete=False) as spool:
+            async for block in iter_upload(file):
+                spool.write(block)
+        try:
+            content = await cpu_pool.run(decode_upload, spool.name, file.filename, request.password)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            os.remove(spool.name)
+        is_encrypted = bool(request.password)
         
         # Convert to base64
         decoded_content = base64.b64encode(content).decode('utf-8')
@@ -269,5 +966,7 @@ async def decode_file(
             decoded_size=len(content),
             is_encrypted=is_encrypted
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
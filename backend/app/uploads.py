@@ -0,0 +1,85 @@
+from typing import Any, Dict
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from fastapi import HTTPException, status
+
+# Configuration
+UPLOAD_DIR = os.environ.get("DNA_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "dna-uploads"))
+UPLOAD_TTL = int(os.environ.get("DNA_UPLOAD_TTL", 24 * 3600))  # seconds since last activity
+MAX_UPLOAD_LENGTH = int(os.environ.get("DNA_MAX_UPLOAD_LENGTH", 64 * 1024 ** 3))
+
+class Upload:
+    """
+    A resumable upload, encoded as its bytes arrive; only the encoded result is kept on disk.
+
+    `encoder` and `writer` hold the in-memory encode state for the received
+    prefix, so an upload survives dropped connections but not a server restart.
+    """
+
+    def __init__(self, owner: str, length: int, directory: str, **params):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.length = length
+        self.offset = 0
+        self.params = params
+        self.finished = False
+        self.encoder: Any = None
+        self.writer: Any = None
+        self.lock = asyncio.Lock()
+        self.updated_at = time.time()
+        self.result_path = os.path.join(directory, f"{self.id}.result")
+
+    def remove_files(self) -> None:
+        if os.path.exists(self.result_path):
+            os.remove(self.result_path)
+
+class UploadStore:
+    """Registry of resumable uploads, purged `ttl` seconds after their last activity."""
+
+    def __init__(self, directory: str = UPLOAD_DIR, ttl: float = UPLOAD_TTL,
+                 max_length: int = MAX_UPLOAD_LENGTH):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_length = max_length
+        self._uploads: Dict[str, Upload] = {}
+
+    def create(self, owner: str, length: int, **params) -> Upload:
+        """Register a new upload of length bytes."""
+        self.purge_expired()
+        if length < 0:
+            raise HTTPException(status_code=400, detail="Upload-Length must not be negative")
+        if length > self.max_length:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload-Length exceeds the maximum of {self.max_length} bytes"
+            )
+        os.makedirs(self.directory, exist_ok=True)
+        upload = Upload(owner, length, self.directory, **params)
+        open(upload.result_path, 'wb').close()
+        self._uploads[upload.id] = upload
+        return upload
+
+    def get(self, upload_id: str, owner: str) -> Upload:
+        """Return the upload, raising 404 if it does not exist or belongs to another user."""
+        upload = self._uploads.get(upload_id)
+        if upload is None or upload.owner != owner:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        upload.updated_at = time.time()
+        return upload
+
+    def discard(self, upload: Upload) -> None:
+        """Forget an upload and delete its files."""
+        self._uploads.pop(upload.id, None)
+        upload.remove_files()
+
+    def purge_expired(self) -> None:
+        """Discard uploads that have been idle for longer than the TTL."""
+        cutoff = time.time() - self.ttl
+        for upload in list(self._uploads.values()):
+            if upload.updated_at < cutoff and not upload.lock.locked():
+                self.discard(upload)
+
+upload_store = UploadStore()
@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+import asyncio
+import functools
+import os
+from fastapi import HTTPException, status
+
+# Configuration
+CPU_WORKERS = int(os.environ.get("DNA_CPU_WORKERS", os.cpu_count() or 1))
+CPU_QUEUE_DEPTH = int(os.environ.get("DNA_CPU_QUEUE_DEPTH", 64))
+
+class CpuPool:
+    """
+    Bounded process pool that keeps CPU-bound encode/decode work off the event loop.
+
+    At most `workers` jobs run at once and at most `queue_depth` more may wait
+    for a slot; past that, callers get a 503 so clients back off instead of
+    piling up unbounded work. Requests that make several calls reserve a
+    slot once up front (admit/reserve) and then call run() with wait=True,
+    so they are never rejected halfway through.
+    """
+
+    def __init__(self, workers: int = CPU_WORKERS, queue_depth: int = CPU_QUEUE_DEPTH):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def reserve(self) -> None:
+        """Take a slot for a request, raising 503 if the pool is at capacity; pair with release()."""
+        if self.pending >= self.workers + self.queue_depth:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+
+    def release(self) -> None:
+        """Give back a slot taken by reserve()."""
+        self.pending -= 1
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Hold a slot for the duration of a with block."""
+        self.reserve()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def run(self, func: Callable, *args: Any, wait: bool = False) -> Any:
+        """
+        Run func(*args) in a worker process and return its result.
+
+        Without wait the call takes its own slot and may be rejected with 503.
+        With wait=True it queues regardless of depth, for callers that hold a
+        slot already or are bounded elsewhere (like background jobs).
+        """
+        if not wait:
+            with self.admit():
+                return await self.run(func, *args, wait=True)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts lazily on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._semaphore = None
+
+cpu_pool = CpuPool()
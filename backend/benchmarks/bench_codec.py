@@ -0,0 +1,62 @@
+"""
+Benchmark the byte <-> DNA codec used by the API (main.bytes_to_dna / dna_to_bytes).
+
+Compares the original per-byte string builder, the pure-Python 2-bit
+reference loop and the table-driven codec, in MB of input per second.
+Run from the backend directory:
+
+    python benchmarks/bench_codec.py
+"""
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import codec  # noqa: E402
+from app.main import bytes_to_dna, dna_to_bytes  # noqa: E402
+
+SIZES = [64 * 1024, 1024 * 1024, 16 * 1024 * 1024]
+# The Python loops are too slow to time on the largest inputs
+PYTHON_LOOP_MAX_SIZE = 1024 * 1024
+
+
+def legacy_bytes_to_dna(data: bytes) -> str:
+    """Original main.bytes_to_dna: one base per byte, built with string +=."""
+    dna = ""
+    for byte in data:
+        dna += "ACGT"[byte % 4]
+    return dna
+
+
+def throughput(func, arg, size: int) -> float:
+    """Best-of-3 throughput of func(arg) in MB/s of input bytes."""
+    number = max(1, (4 * 1024 * 1024) // size)
+    seconds = min(timeit.repeat(lambda: func(arg), number=number, repeat=3)) / number
+    return size / seconds / 1e6
+
+
+def main() -> None:
+    print(f"{'size':>10} {'direction':>10} {'legacy':>10} {'reference':>10} {'table':>10}  (MB/s)")
+    for size in SIZES:
+        data = os.urandom(size)
+        dna = bytes_to_dna(data)
+        assert dna_to_bytes(dna) == data
+
+        if size <= PYTHON_LOOP_MAX_SIZE:
+            assert dna == codec.binary_to_dna_reference(data)
+            legacy = f"{throughput(legacy_bytes_to_dna, data, size):10.2f}"
+            reference_encode = f"{throughput(codec.binary_to_dna_reference, data, size):10.2f}"
+            reference_decode = f"{throughput(codec.dna_to_binary_reference, dna, size):10.2f}"
+        else:
+            legacy = reference_encode = reference_decode = f"{'-':>10}"
+
+        print(f"{size:>10} {'encode':>10} {legacy} {reference_encode} "
+              f"{throughput(bytes_to_dna, data, size):10.2f}")
+        print(f"{size:>10} {'decode':>10} {'-':>10} {reference_decode} "
+              f"{throughput(dna_to_bytes, dna, size):10.2f}")
+
+
+if __name__ == "__main__":
+    main()
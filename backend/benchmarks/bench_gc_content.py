@@ -0,0 +1,74 @@
+"""
+Benchmark DNAEncoder._optimize_gc_content against the original quadratic balancer.
+
+Run from the backend directory:
+
+    python benchmarks/bench_gc_content.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.dna_encoder import DNAEncoder  # noqa: E402
+
+LENGTHS = [200, 1000, 1800]
+
+
+def legacy_optimize_gc_content(encoder: DNAEncoder, sequence: str) -> str:
+    """Original balancer: recounts G/C over the whole strand after every flip."""
+    gc_content = (sequence.count('G') + sequence.count('C')) / len(sequence)
+
+    if abs(gc_content - encoder.TARGET_GC_CONTENT) <= encoder.GC_CONTENT_TOLERANCE:
+        return sequence
+
+    sequence_list = list(sequence)
+    if gc_content < encoder.TARGET_GC_CONTENT:
+        for i in range(len(sequence_list)):
+            if sequence_list[i] in ['A', 'T']:
+                sequence_list[i] = 'G' if np.random.random() < 0.5 else 'C'
+                gc_content = (sequence_list.count('G') + sequence_list.count('C')) / len(sequence_list)
+                if abs(gc_content - encoder.TARGET_GC_CONTENT) <= encoder.GC_CONTENT_TOLERANCE:
+                    break
+    else:
+        for i in range(len(sequence_list)):
+            if sequence_list[i] in ['G', 'C']:
+                sequence_list[i] = 'A' if np.random.random() < 0.5 else 'T'
+                gc_content = (sequence_list.count('G') + sequence_list.count('C')) / len(sequence_list)
+                if abs(gc_content - encoder.TARGET_GC_CONTENT) <= encoder.GC_CONTENT_TOLERANCE:
+                    break
+
+    return ''.join(sequence_list)
+
+
+def at_rich_strand(length: int, rng: np.random.Generator) -> str:
+    """Strand with ~10% GC content, so both balancers have to flip many bases."""
+    return ''.join(rng.choice(list('ATATATATAT' * 9 + 'GCGCGCGCGC'), size=length))
+
+
+def main() -> None:
+    encoder = DNAEncoder()
+    rng = np.random.default_rng(0)
+    print(f"{'length':>8} {'legacy (us)':>12} {'linear (us)':>12} {'speedup':>8}")
+    for length in LENGTHS:
+        strand = at_rich_strand(length, rng)
+
+        # Same seed -> both balancers must flip the same bases to the same nucleotides
+        np.random.seed(length)
+        expected = legacy_optimize_gc_content(encoder, strand)
+        np.random.seed(length)
+        assert encoder._optimize_gc_content(strand) == expected
+
+        number = max(1, 20000 // length)
+        legacy = min(timeit.repeat(lambda: legacy_optimize_gc_content(encoder, strand),
+                                   number=number, repeat=3)) / number
+        linear = min(timeit.repeat(lambda: encoder._optimize_gc_content(strand),
+                                   number=number, repeat=3)) / number
+        print(f"{length:>8} {legacy * 1e6:>12.1f} {linear * 1e6:>12.1f} {legacy / linear:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
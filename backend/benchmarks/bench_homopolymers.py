@@ -0,0 +1,60 @@
+"""
+Benchmark DNAEncoder's vectorized homopolymer fixer against the original sliding-window loop.
+
+Both fix a batch of strands; the vectorized fixer handles the whole batch in
+one pass. Run from the backend directory:
+
+    python benchmarks/bench_homopolymers.py
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.dna_encoder import DNAEncoder  # noqa: E402
+
+STRAND_LENGTH = 200
+BATCH_SIZES = [1, 100, 10000]
+
+
+def legacy_avoid_homopolymers(encoder: DNAEncoder, sequence: str) -> str:
+    """Original fixer: builds a set for every window and draws each replacement separately."""
+    result = list(sequence)
+    i = 0
+    while i < len(result) - encoder.MAX_HOMOPOLYMER_LENGTH:
+        window = result[i:i + encoder.MAX_HOMOPOLYMER_LENGTH + 1]
+        if len(set(window)) == 1:
+            alternatives = [n for n in encoder.NUCLEOTIDES if n != window[0]]
+            result[i + encoder.MAX_HOMOPOLYMER_LENGTH] = np.random.choice(alternatives)
+        i += 1
+    return ''.join(result)
+
+
+def longest_run(sequence: str) -> int:
+    return max((len(match.group(0)) for match in re.finditer(r'(.)\1*', sequence)), default=0)
+
+
+def main() -> None:
+    encoder = DNAEncoder()
+    rng = np.random.default_rng(0)
+    print(f"{'strands':>8} {'legacy (ms)':>12} {'batch (ms)':>12} {'speedup':>8}")
+    for batch_size in BATCH_SIZES:
+        # A/T-heavy strands are full of long runs
+        strands = [''.join(rng.choice(list('AAAAAAT'), size=STRAND_LENGTH)) for _ in range(batch_size)]
+        assert all(longest_run(strand) <= encoder.MAX_HOMOPOLYMER_LENGTH
+                   for strand in encoder._avoid_homopolymers_batch(strands))
+
+        number = max(1, 1000 // batch_size)
+        legacy = min(timeit.repeat(lambda: [legacy_avoid_homopolymers(encoder, s) for s in strands],
+                                   number=number, repeat=3)) / number
+        batch = min(timeit.repeat(lambda: encoder._avoid_homopolymers_batch(strands),
+                                  number=number, repeat=3)) / number
+        print(f"{batch_size:>8} {legacy * 1e3:>12.2f} {batch * 1e3:>12.2f} {legacy / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark the batched Reed-Solomon codec against per-chunk reedsolo calls.
+
+Encodes and decodes a batch of 48-byte chunks (the DNAEncoder default at
+200 bp) at the "basic" and "robust" ECC levels. Run from the backend directory:
+
+    python benchmarks/bench_reed_solomon.py
+"""
+import os
+import sys
+import timeit
+from pathlib import Path
+
+from reedsolo import RSCodec
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.reed_solomon import BatchRSCodec  # noqa: E402
+
+CHUNK_SIZE = 48
+CHUNK_COUNT = 5000
+ECC_LEVELS = {"basic": 8, "robust": 16}
+
+
+def best(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=3))
+
+
+def main() -> None:
+    chunks = [os.urandom(CHUNK_SIZE) for _ in range(CHUNK_COUNT)]
+    print(f"{CHUNK_COUNT} chunks of {CHUNK_SIZE} bytes")
+    print(f"{'level':>8} {'step':>8} {'reedsolo (ms)':>14} {'batch (ms)':>12} {'speedup':>8}")
+    for level, nsym in ECC_LEVELS.items():
+        codec = RSCodec(nsym)
+        batch = BatchRSCodec(nsym)
+        codewords = batch.encode(chunks)
+        assert codewords == [bytes(codec.encode(chunk)) for chunk in chunks]
+        assert batch.decode(codewords) == chunks
+
+        timings = {
+            "encode": (best(lambda: [codec.encode(chunk) for chunk in chunks]),
+                       best(lambda: batch.encode(chunks))),
+            "decode": (best(lambda: [codec.decode(codeword) for codeword in codewords]),
+                       best(lambda: batch.decode(codewords))),
+        }
+        for step, (reference, batched) in timings.items():
+            print(f"{level:>8} {step:>8} {reference * 1e3:>14.1f} {batched * 1e3:>12.1f} "
+                  f"{reference / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()